@@ -1,15 +1,31 @@
 import streamlit as st
 import tempfile
 import os
+import io
+import shutil
+import contextlib
 from pathlib import Path
-import json
 import uuid
 import zipfile
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List
 
-from src.services.batch_processor import BatchProcessor
 from src.models.job_description_model import JobDescription
 
+if TYPE_CHECKING:
+    from src.services.batch_processor import BatchProcessor
+
+# Keep resume temp files on tmpfs when available so they never touch the disk; files that
+# do not fit (Docker's default /dev/shm is 64 MB) fall back to the default temp directory
+TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+@st.cache_resource
+def get_batch_processor() -> "BatchProcessor":
+    """Create the batch processor once and reuse it across reruns and sessions."""
+    # Imported here so the page renders before torch/langchain/chromadb load
+    from src.services.batch_processor import BatchProcessor
+    return BatchProcessor()
+
 def render_batch_mode():
     """Render the batch processing interface."""
     st.header("Batch Resume Shortlisting")
@@ -72,7 +88,7 @@ def render_batch_mode():
             # Show file list
             with st.expander("Uploaded Files"):
                 for i, file in enumerate(uploaded_files, 1):
-                    file_size = len(file.getvalue()) / 1024
+                    file_size = file.size / 1024
                     st.write(f"{i}. {file.name} ({file_size:.1f} KB)")
     
     else:
@@ -83,30 +99,25 @@ def render_batch_mode():
         )
         
         if zip_file:
-            # Extract files from ZIP
-            with tempfile.TemporaryDirectory() as temp_dir:
-                zip_path = os.path.join(temp_dir, "resumes.zip")
-                with open(zip_path, "wb") as f:
-                    f.write(zip_file.getvalue())
-                
-                try:
-                    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                        file_list = [name for name in zip_ref.namelist() 
-                                   if name.lower().endswith(('.pdf', '.txt')) and not name.startswith('__MACOSX')]
-                        
-                        st.success(f"ZIP file contains {len(file_list)} resume files")
-                        
-                        # Show file list
-                        with st.expander("Files in ZIP"):
-                            for i, filename in enumerate(file_list, 1):
-                                st.write(f"{i}. {filename}")
-                        
-                        # Store file info for processing
-                        st.session_state['zip_file'] = zip_file
-                        st.session_state['zip_files'] = file_list
-                
-                except Exception as e:
-                    st.error(f"Error reading ZIP file: {str(e)}")
+            # Read the archive index straight from the upload buffer
+            try:
+                with zipfile.ZipFile(io.BytesIO(zip_file.getvalue())) as zip_ref:
+                    file_list = [name for name in zip_ref.namelist() 
+                               if name.lower().endswith(('.pdf', '.txt')) and not name.startswith('__MACOSX')]
+                    
+                    st.success(f"ZIP file contains {len(file_list)} resume files")
+                    
+                    # Show file list
+                    with st.expander("Files in ZIP"):
+                        for i, filename in enumerate(file_list, 1):
+                            st.write(f"{i}. {filename}")
+                    
+                    # Store file info for processing
+                    st.session_state['zip_file'] = zip_file
+                    st.session_state['zip_files'] = file_list
+            
+            except Exception as e:
+                st.error(f"Error reading ZIP file: {str(e)}")
     
     # Analysis button
     st.markdown("---")
@@ -134,82 +145,119 @@ def render_batch_mode():
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        try:
-            # Create job description object
-            job_desc = JobDescription(
-                id=str(uuid.uuid4()),
-                title=job_title or "Batch Analysis",
-                content=job_description_text,
-                sections={"full_content": job_description_text},
-                requirements=[]
-            )
-            
-            # Process files
-            temp_file_paths = []
-            
-            status_text.text("Preparing files for analysis...")
-            progress_bar.progress(10)
-            
-            if upload_method == "Multiple Files":
-                # Save uploaded files temporarily
-                for i, uploaded_file in enumerate(files_to_process):
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-                        tmp_file.write(uploaded_file.getvalue())
-                        temp_file_paths.append(tmp_file.name)
-            else:
-                # Extract ZIP files
-                temp_file_paths = extract_zip_files(st.session_state['zip_file'], st.session_state['zip_files'])
-            
-            progress_bar.progress(25)
-            status_text.text("Running AI analysis on all resumes...")
-            
-            # Initialize batch processor and run analysis
-            processor = BatchProcessor()
-            result = processor.process_batch_resumes(temp_file_paths, job_desc, top_n)
-            
-            progress_bar.progress(100)
-            status_text.text("Analysis completed!")
-            
-            # Display results
-            display_batch_results(result)
+        # Every temp file is registered here and removed in one place, on success or failure
+        with contextlib.ExitStack() as cleanup:
+            try:
+                # Create job description object
+                job_desc = JobDescription(
+                    id=str(uuid.uuid4()),
+                    title=job_title or "Batch Analysis",
+                    content=job_description_text,
+                    sections={"full_content": job_description_text},
+                    requirements=[]
+                )
+                
+                # Process files
+                temp_file_paths = []
+                
+                status_text.text("Preparing files for analysis...")
+                progress_bar.progress(10)
+                
+                if upload_method == "Multiple Files":
+                    # Save uploaded files temporarily
+                    for uploaded_file in files_to_process:
+                        temp_file_paths.append(_save_temp_file(
+                            lambda uploaded_file=uploaded_file: _rewound(uploaded_file),
+                            f".{uploaded_file.name.split('.')[-1]}", cleanup
+                        ))
+                else:
+                    # Extract ZIP files; every temp file is registered with cleanup as it is created
+                    temp_file_paths = extract_zip_files(st.session_state['zip_file'], st.session_state['zip_files'],
+                                                        cleanup)
+                
+                progress_bar.progress(25)
+                status_text.text("Running AI analysis on all resumes...")
+                
+                # Initialize batch processor and run analysis
+                processor = get_batch_processor()
+                result = processor.process_batch_resumes(temp_file_paths, job_desc, top_n)
+                
+                progress_bar.progress(100)
+                status_text.text("Analysis completed!")
+                
+                # Display results
+                display_batch_results(result)
             
-            # Clean up temp files
-            for temp_path in temp_file_paths:
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-        
-        except Exception as e:
-            st.error(f"Batch analysis failed: {str(e)}")
-            # Clean up on error
-            if 'temp_file_paths' in locals():
-                for temp_path in temp_file_paths:
-                    try:
-                        os.unlink(temp_path)
-                    except:
-                        pass
+            except Exception as e:
+                st.error(f"Batch analysis failed: {str(e)}")
+
+def _remove_temp_file(path: str):
+    """Delete a temp file, ignoring files that are already gone."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def _rewound(uploaded_file) -> contextlib.nullcontext:
+    """Rewind an upload and wrap it so a with-block does not close it."""
+    uploaded_file.seek(0)
+    return contextlib.nullcontext(uploaded_file)
 
-def extract_zip_files(zip_file, file_list: List[str]) -> List[str]:
-    """Extract files from ZIP and return temp file paths."""
+def _save_temp_file(open_source, suffix: str, cleanup: contextlib.ExitStack) -> str:
+    """Copy the stream returned by open_source() into a temp file and return its path.
+    
+    The file is registered with cleanup as soon as it exists. When TEMP_DIR runs
+    out of space the partial file is removed and the copy retried in the default
+    temp directory, so open_source must return a fresh stream on every call.
+    """
+    for temp_dir in dict.fromkeys((TEMP_DIR, None)):
+        with open_source() as src_file, \
+                tempfile.NamedTemporaryFile(delete=False, dir=temp_dir, suffix=suffix) as tmp_file:
+            # ExitStack.callback appends to a deque, which is safe from extraction threads
+            cleanup.callback(_remove_temp_file, tmp_file.name)
+            try:
+                # Stream in 1 MiB blocks instead of materializing the file as bytes
+                shutil.copyfileobj(src_file, tmp_file, length=1024 * 1024)
+                # Close here so a failure writing the last buffered bytes also falls back;
+                # the with-block's close afterwards is a no-op
+                tmp_file.close()
+                return tmp_file.name
+            except OSError:
+                if temp_dir is None:
+                    raise
+        _remove_temp_file(tmp_file.name)
+
+def extract_zip_files(zip_file, file_list: List[str], cleanup: contextlib.ExitStack) -> List[str]:
+    """Extract files from ZIP and return temp file paths, registering each with cleanup."""
+    # Workers need one immutable buffer to share; BytesIO.getvalue hands back
+    # the upload's internal bytes without copying
+    archive_bytes = zip_file.getvalue()
+    
+    if len(file_list) < 4:
+        return _extract_zip_entries(archive_bytes, file_list, cleanup)
+    
+    # Each worker reads its own contiguous slice through a private ZipFile handle;
+    # zlib and file writes release the GIL, so entries decompress concurrently
+    max_workers = min(8, len(file_list))
+    slice_size = -(-len(file_list) // max_workers)
+    slices = [file_list[i:i + slice_size] for i in range(0, len(file_list), slice_size)]
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_extract_zip_entries, archive_bytes, names, cleanup) for names in slices]
+        # Collect in submission order to keep paths aligned with file_list
+        return [path for future in futures for path in future.result()]
+
+def _extract_zip_entries(archive_bytes: bytes, file_list: List[str],
+                         cleanup: contextlib.ExitStack) -> List[str]:
+    """Stream the given archive entries into temp files and return their paths."""
     temp_paths = []
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        zip_path = os.path.join(temp_dir, "resumes.zip")
-        with open(zip_path, "wb") as f:
-            f.write(zip_file.getvalue())
-        
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            for filename in file_list:
-                # Extract to temp directory
-                zip_ref.extract(filename, temp_dir)
-                extracted_path = os.path.join(temp_dir, filename)
-                
-                # Create a permanent temp file
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{filename.split('.')[-1]}") as tmp_file:
-                    with open(extracted_path, 'rb') as src_file:
-                        tmp_file.write(src_file.read())
-                    temp_paths.append(tmp_file.name)
+    # BytesIO shares the immutable archive bytes, so readers do not copy them
+    with zipfile.ZipFile(io.BytesIO(archive_bytes)) as zip_ref:
+        for filename in file_list:
+            temp_paths.append(_save_temp_file(
+                lambda filename=filename: zip_ref.open(filename), Path(filename).suffix, cleanup
+            ))
     
     return temp_paths
 
@@ -284,8 +332,7 @@ def display_batch_results(result):
     with col1:
         if st.button("📥 Download Detailed Report", use_container_width=True):
             # Create comprehensive report
-            report_data = result.to_dict()
-            report_json = json.dumps(report_data, indent=2)
+            report_json = result.to_json_bytes(indent=True)
             
             st.download_button(
                 label="Download JSON Report",
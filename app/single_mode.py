@@ -1,13 +1,24 @@
 import streamlit as st
 import tempfile
 import os
+import shutil
 from pathlib import Path
 import json
 import uuid
+from typing import TYPE_CHECKING
 
-from src.services.resume_analyzer import ResumeAnalyzer
 from src.models.job_description_model import JobDescription
 
+if TYPE_CHECKING:
+    from src.services.resume_analyzer import ResumeAnalyzer
+
+@st.cache_resource
+def get_resume_analyzer() -> "ResumeAnalyzer":
+    """Create the resume analyzer once and reuse it across reruns and sessions."""
+    # Imported here so the page renders before torch/langchain load
+    from src.services.resume_analyzer import ResumeAnalyzer
+    return ResumeAnalyzer()
+
 def render_single_mode():
     """Render the single resume analysis interface."""
     st.header("Single Resume Analysis")
@@ -42,7 +53,7 @@ def render_single_mode():
             st.success(f"File uploaded: {uploaded_file.name}")
             
             # Show file details
-            file_size = len(uploaded_file.getvalue()) / 1024
+            file_size = uploaded_file.size / 1024
             st.info(f"File size: {file_size:.1f} KB")
     
     # Analysis button
@@ -62,7 +73,8 @@ def render_single_mode():
             try:
                 # Save uploaded file temporarily
                 with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
+                    uploaded_file.seek(0)
+                    shutil.copyfileobj(uploaded_file, tmp_file, length=1024 * 1024)
                     tmp_file_path = tmp_file.name
                 
                 # Create job description object
@@ -75,7 +87,7 @@ def render_single_mode():
                 )
                 
                 # Initialize analyzer and run analysis
-                analyzer = ResumeAnalyzer()
+                analyzer = get_resume_analyzer()
                 result = analyzer.analyze_single_resume(tmp_file_path, job_desc)
                 
                 # Display results
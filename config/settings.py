@@ -1,14 +1,39 @@
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
-from pydantic import BaseSettings
+from typing import Dict, Any, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 os.environ["ANONYMIZED_TELEMETRY"] = "False"
 
+# Embedding model presets selectable through EMBEDDING_MODEL_VARIANT
+EMBEDDING_MODEL_PRESETS: Dict[str, Dict[str, Any]] = {
+    "mpnet-fp32": {
+        "model_name": "sentence-transformers/all-mpnet-base-v2",
+        "dimension": 768
+    },
+    "minilm-fp32": {
+        "model_name": "sentence-transformers/all-MiniLM-L6-v2",
+        "dimension": 384
+    },
+    "minilm-int8": {
+        "model_name": "sentence-transformers/all-MiniLM-L6-v2",
+        "dimension": 384,
+        "onnx_file": "onnx/model_quint8_avx2.onnx"
+    }
+}
+
 class Settings(BaseSettings):
+    # Frozen so the shared instance is safe to read from any thread
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+    
     # Embedding Model Configuration
-    EMBEDDING_MODEL: str = "sentence-transformers/all-mpnet-base-v2"
-    EMBEDDING_DIMENSION: int = 768
+    EMBEDDING_MODEL_VARIANT: str = "minilm-int8"
+    # Texts per model forward pass; batch mode also groups up to this many resumes per encode call
+    EMBEDDING_BATCH_SIZE: int = 64
+    # Directory for the on-disk embedding cache; unset keeps embeddings in memory only.
+    # The cache is not size-bounded and holds embeddings of every resume processed.
+    EMBEDDING_CACHE_DIR: Optional[str] = None
     
     # ChromaDB Configuration
     CHROMA_PERSIST_DIRECTORY: str = "./chroma_db"
@@ -24,8 +49,16 @@ class Settings(BaseSettings):
     
     # Batch Processing
     MAX_BATCH_SIZE: int = 100
+    # Batches are always ranked in memory; enable to also persist them to ChromaDB
+    USE_CHROMA_FOR_BATCH: bool = False
+    # Only the top PREFILTER_MULTIPLIER * top_n TF-IDF matches are embedded; 0 disables
+    PREFILTER_MULTIPLIER: int = 3
     
-    class Config:
-        env_file = ".env"
+    @property
+    def EMBEDDING_DIMENSION(self) -> int:
+        return EMBEDDING_MODEL_PRESETS[self.EMBEDDING_MODEL_VARIANT]["dimension"]
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings on first use and return the same instance afterwards."""
+    return Settings()
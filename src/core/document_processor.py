@@ -1,16 +1,57 @@
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 import logging
+import multiprocessing
+import os
+import re
+import threading
+from functools import lru_cache
+from itertools import groupby
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from langchain_community.document_loaders import PyPDFLoader
+import pypdfium2 as pdfium
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
 logger = logging.getLogger(__name__)
 
+_WS_RE = re.compile(r"[\x00\s]+")
+
+# PDFium is not thread-safe; serialize every call into it within a process
+_PDFIUM_LOCK = threading.Lock()
+
+# Parser workers start from a clean process instead of forking the threaded Streamlit
+# server, which could copy _PDFIUM_LOCK (or PDFium state) while another session holds it
+_WORKER_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Section headers mapped to the section they fill; None marks headers that only end a section
+_SECTION_HEADERS = {
+    'skills': 'skills', 'technical skills': 'skills', 'competencies': 'skills', 'technologies': 'skills',
+    'experience': 'experience', 'work experience': 'experience', 'employment': 'experience',
+    'professional experience': 'experience',
+    'education': 'education', 'academic': 'education', 'qualifications': 'education', 'degrees': 'education',
+    'summary': None, 'objective': None, 'projects': None, 'certifications': None,
+    'awards': None, 'references': None
+}
+
+_SECTION_HEADER_RE = re.compile(
+    r"^[ \t]*(?P<name>"
+    + "|".join(re.escape(header).replace(r"\ ", r"\s+")
+               for header in sorted(_SECTION_HEADERS, key=len, reverse=True))
+    + r")[ \t]*:?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
 class DocumentProcessor:
     """Processes and extracts text from various document formats."""
     
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200, enable_splitting: bool = True,
+                 use_pdfium: bool = True):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.enable_splitting = enable_splitting
+        self.use_pdfium = use_pdfium
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
@@ -20,13 +61,87 @@ class DocumentProcessor:
     def load_pdf(self, file_path: str) -> List[Document]:
         """Load and process PDF documents."""
         try:
-            loader = PyPDFLoader(file_path)
-            documents = loader.load()
+            if self.use_pdfium:
+                documents = self._load_pdf_pages(file_path)
+            else:
+                from langchain_community.document_loaders import PyPDFLoader
+                loader = PyPDFLoader(file_path)
+                documents = loader.load()
             return self._process_documents(documents)
         except Exception as e:
             logger.error(f"Error loading PDF {file_path}: {e}")
             raise
     
+    def _load_pdf_pages(self, file_path: str) -> List[Document]:
+        """Extract one document per page using the PDFium engine."""
+        page_texts = self._read_page_texts(file_path)
+        return [
+            Document(
+                page_content=text,
+                metadata={"source": file_path, "page": page_number, "pages": len(page_texts), "type": "pdf"}
+            )
+            for page_number, text in enumerate(page_texts)
+        ]
+    
+    def _read_page_texts(self, file_path: str) -> List[str]:
+        """Read the raw text of each PDF page using the PDFium engine."""
+        # Streamlit sessions parse on separate threads, so the whole document is read under the lock
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                page_texts = []
+                for page_number in range(len(pdf)):
+                    page = pdf[page_number]
+                    text_page = page.get_textpage()
+                    try:
+                        page_texts.append(text_page.get_text_range())
+                    finally:
+                        text_page.close()
+                        page.close()
+                return page_texts
+            finally:
+                pdf.close()
+    
+    def parse_resume(self, file_path: str) -> Tuple[str, Dict[str, str]]:
+        """Load a resume PDF and return its full text and key sections."""
+        if self.use_pdfium and not self.enable_splitting:
+            # Clean page text and join once; no per-page Document objects
+            try:
+                content = "\n".join(self._clean_text(text) for text in self._read_page_texts(file_path))
+            except Exception as e:
+                logger.error(f"Error loading PDF {file_path}: {e}")
+                raise
+        else:
+            content = "\n".join(doc.page_content for doc in self.load_pdf(file_path))
+        return content, self.extract_key_sections(content)
+    
+    def iter_resumes_parallel(self, file_paths: List[str], max_workers: Optional[int] = None
+                              ) -> Iterator[Tuple[str, Optional[Tuple[str, Dict[str, str]]]]]:
+        """Yield (path, (content, sections)) pairs as each resume finishes parsing in a worker process.
+        
+        Section extraction runs in the workers too, and only the text crosses the
+        process boundary. The parsed pair is None for files that fail to load.
+        """
+        if len(file_paths) < 4:
+            # Process start-up costs more than parsing a handful of files
+            for file_path in file_paths:
+                try:
+                    yield file_path, self.parse_resume(file_path)
+                except Exception:
+                    yield file_path, None
+            return
+        
+        max_workers = min(len(file_paths), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=_WORKER_CONTEXT,
+                                 initializer=_init_pdf_worker,
+                                 initargs=(self.chunk_size, self.chunk_overlap,
+                                           self.enable_splitting, self.use_pdfium)) as executor:
+            future_to_path = {executor.submit(_parse_single_resume, file_path): file_path
+                              for file_path in file_paths}
+            for future in as_completed(future_to_path):
+                yield future_to_path[future], future.result()
+    
     def load_text_file(self, file_path: str) -> List[Document]:
         """Load and process text files."""
         try:
@@ -52,32 +167,27 @@ class DocumentProcessor:
     
     def _process_documents(self, documents: List[Document]) -> List[Document]:
         """Split documents into chunks and clean text."""
-        processed_docs = []
+        needs_splitting = False
         
         for doc in documents:
             # Clean and preprocess text
-            cleaned_content = self._clean_text(doc.page_content)
-            doc.page_content = cleaned_content
-            
-            # Split into chunks if content is large
-            if len(cleaned_content) > 1000:
-                chunks = self.text_splitter.split_documents([doc])
-                processed_docs.extend(chunks)
-            else:
-                processed_docs.append(doc)
+            doc.page_content = self._clean_text(doc.page_content)
+            needs_splitting = needs_splitting or len(doc.page_content) > self.chunk_size
+        
+        # Split everything in one pass when any document is large; documents
+        # already under chunk_size come back from the splitter as a single chunk
+        if self.enable_splitting and needs_splitting:
+            return self.text_splitter.split_documents(documents)
         
-        return processed_docs
+        return documents
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text content."""
-        # Remove extra whitespace and normalize
-        text = ' '.join(text.split())
-        # Remove special characters that might interfere with processing
-        text = text.replace('\x00', '')  # Remove null characters
-        return text.strip()
+        # Collapse whitespace runs and null characters in a single pass
+        return _WS_RE.sub(' ', text).strip()
     
     def extract_key_sections(self, content: str) -> Dict[str, str]:
-        """Extract key sections from resume content using pattern matching."""
+        """Extract key sections from resume content using header matching."""
         sections = {
             'skills': '',
             'experience': '',
@@ -86,45 +196,41 @@ class DocumentProcessor:
             'full_content': content
         }
         
-        # Simple section extraction based on common patterns
-        content_lower = content.lower()
+        # Locate every section header in a single regex pass
+        headers = [
+            (_SECTION_HEADERS[' '.join(match.group('name').lower().split())], match.start(), match.end())
+            for match in _SECTION_HEADER_RE.finditer(content)
+        ]
+        body_ends = [start for _, start, _ in headers[1:]] + [len(content)]
         
-        # Extract skills section
-        skills_patterns = ['skills', 'technical skills', 'competencies', 'technologies']
-        sections['skills'] = self._extract_section_by_patterns(content, skills_patterns)
-        
-        # Extract experience section
-        exp_patterns = ['experience', 'work experience', 'employment', 'professional experience']
-        sections['experience'] = self._extract_section_by_patterns(content, exp_patterns)
-        
-        # Extract education section
-        edu_patterns = ['education', 'academic', 'qualifications', 'degrees']
-        sections['education'] = self._extract_section_by_patterns(content, edu_patterns)
-        
-        return sections
-    
-    def _extract_section_by_patterns(self, content: str, patterns: List[str]) -> str:
-        """Extract text section based on header patterns."""
-        content_lines = content.split('\n')
-        section_content = []
-        in_section = False
-        
-        for line in content_lines:
-            line_lower = line.lower().strip()
-            
-            # Check if line contains any of the section patterns
-            if any(pattern in line_lower for pattern in patterns):
-                in_section = True
+        # A section runs until the next header of a different section; repeated
+        # headers of the same section (e.g. "Skills" then "Technical Skills") merge
+        for bucket, group in groupby(zip(headers, body_ends), key=lambda item: item[0][0]):
+            if bucket is None or sections[bucket]:
                 continue
-            
-            # Check if we've hit another section (common section headers)
-            common_sections = ['summary', 'objective', 'skills', 'experience', 'education', 
-                             'projects', 'certifications', 'awards', 'references']
-            if in_section and any(section in line_lower for section in common_sections):
-                if not any(pattern in line_lower for pattern in patterns):
-                    break
-            
-            if in_section and line.strip():
-                section_content.append(line)
+            body = '\n'.join(content[body_start:body_end] for (_, _, body_start), body_end in group)
+            sections[bucket] = '\n'.join(line for line in body.split('\n') if line.strip()).strip()
         
-        return '\n'.join(section_content).strip()
\ No newline at end of file
+        return sections
+
+@lru_cache(maxsize=4)
+def get_document_processor(enable_splitting: bool = True) -> DocumentProcessor:
+    """Build a DocumentProcessor on first use per configuration and share it afterwards."""
+    return DocumentProcessor(enable_splitting=enable_splitting)
+
+
+# Per-process state for iter_resumes_parallel workers
+_worker_processor: Optional[DocumentProcessor] = None
+
+def _init_pdf_worker(chunk_size: int, chunk_overlap: int, enable_splitting: bool, use_pdfium: bool):
+    """Create the DocumentProcessor used by a PDF worker process."""
+    global _worker_processor
+    _worker_processor = DocumentProcessor(chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                          enable_splitting=enable_splitting, use_pdfium=use_pdfium)
+
+def _parse_single_resume(file_path: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Parse one resume in a worker process; errors are logged by load_pdf."""
+    try:
+        return _worker_processor.parse_resume(file_path)
+    except Exception:
+        return None
@@ -1,39 +1,217 @@
-from typing import List, Optional
-import torch
-from sentence_transformers import SentenceTransformer
+from typing import List, Dict, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import os
+import tempfile
+import threading
+import numpy as np
 import logging
 
+from config.settings import get_settings, EMBEDDING_MODEL_PRESETS
+
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4)
+def _load_model(variant: str):
+    """Load the model for a preset once per process and share it across managers."""
+    preset = EMBEDDING_MODEL_PRESETS[variant]
+    if preset.get("onnx_file"):
+        model = _OnnxSentenceEncoder(preset["model_name"], preset["onnx_file"])
+        logger.info(f"Loaded embedding model: {variant} (onnxruntime)")
+        return model
+    
+    # torch and sentence_transformers take seconds to import; defer them to first use
+    import torch
+    from sentence_transformers import SentenceTransformer
+    
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = SentenceTransformer(preset["model_name"], device=device)
+    if device == "cuda":
+        # FP16 weights halve activation traffic and run on tensor cores
+        model.half()
+    logger.info(f"Loaded embedding model: {variant} ({device})")
+    return model
+
+class _OnnxSentenceEncoder:
+    """Mean-pooling sentence encoder over a quantized ONNX export, mirroring SentenceTransformer.encode."""
+    
+    def __init__(self, model_name: str, onnx_file: str, max_seq_length: int = 256):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        
+        subfolder, _, file_name = onnx_file.rpartition("/")
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_name, subfolder=subfolder, file_name=file_name
+        )
+        self.max_seq_length = max_seq_length
+    
+    def encode(self, texts: List[str], batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False, show_progress_bar: bool = False) -> np.ndarray:
+        """Encode texts into (N, dim) float32 sentence embeddings."""
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size], padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors="np"
+            )
+            token_embeddings = self.model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32, copy=False))
+        return np.concatenate(batches)
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.config.hidden_size
+
 class EmbeddingManager:
     """Manages text embeddings using Hugging Face sentence transformers."""
     
-    def __init__(self, model_name: str = "sentence-transformers/all-mpnet-base-v2"):
-        """Initialize the embedding model."""
+    def __init__(self, variant: Optional[str] = None, batch_size: Optional[int] = None,
+                 cache_dir: Optional[str] = None, memory_cache_size: int = 1024):
+        """Initialize the embedding model preset and the in-memory and on-disk embedding caches.
+        
+        The disk cache is used only when cache_dir or the EMBEDDING_CACHE_DIR setting is set.
+        """
         try:
-            self.model = SentenceTransformer(model_name)
-            self.model_name = model_name
-            logger.info(f"Loaded embedding model: {model_name}")
+            self.variant = variant or get_settings().EMBEDDING_MODEL_VARIANT
+            self.model = _load_model(self.variant)
+            self.model_name = EMBEDDING_MODEL_PRESETS[self.variant]["model_name"]
+            self.batch_size = batch_size or get_settings().EMBEDDING_BATCH_SIZE
+            cache_dir = cache_dir or get_settings().EMBEDDING_CACHE_DIR
+            self.cache_dir = Path(cache_dir) if cache_dir else None
+            self.memory_cache_size = memory_cache_size
+            self._memory_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+            # Managers are shared across Streamlit sessions, which call in from separate threads
+            self._memory_cache_lock = threading.Lock()
+            if self.cache_dir is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
         except Exception as e:
             logger.error(f"Failed to load embedding model: {e}")
             raise
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts."""
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate L2-normalized embeddings for a list of texts as a (N, dim) float32 array.
+        
+        Embeddings are cached by content hash in memory (and on disk when enabled), so only
+        unseen texts reach the model, each of them once.
+        """
         try:
-            embeddings = self.model.encode(texts, convert_to_tensor=False)
-            return embeddings.tolist() if hasattr(embeddings, 'tolist') else embeddings
+            if not texts:
+                return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+            
+            embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+            misses: Dict[str, List[int]] = {}
+            
+            for i, text in enumerate(texts):
+                key = self._cache_key(text)
+                embeddings[i] = self._cache_get(key)
+                if embeddings[i] is None:
+                    misses.setdefault(key, []).append(i)
+            
+            if misses:
+                miss_keys = list(misses)
+                encoded = self._encode([texts[misses[key][0]] for key in miss_keys])
+                for key, embedding in zip(miss_keys, encoded):
+                    self._cache_put(key, embedding)
+                    for i in misses[key]:
+                        embeddings[i] = embedding
+                logger.info(f"Embedding cache: {len(texts) - sum(map(len, misses.values()))} hits, "
+                            f"{len(miss_keys)} encoded")
+            
+            return np.stack(embeddings).astype(np.float32, copy=False)
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
             raise
     
-    def generate_single_embedding(self, text: str) -> List[float]:
-        """Generate embedding for a single text."""
-        return self.generate_embeddings([text])[0]
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Run the model over texts in large batches."""
+        import torch
+        
+        with torch.inference_mode():
+            embeddings = self.model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+        return embeddings.astype(np.float32, copy=False)
+    
+    def _cache_key(self, text: str) -> str:
+        """Hash the model preset and text into a cache file name."""
+        return hashlib.blake2b(f"{self.variant}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[np.ndarray]:
+        """Look up a cached embedding in memory, then on disk; None on a miss."""
+        with self._memory_cache_lock:
+            embedding = self._memory_cache.get(key)
+            if embedding is not None:
+                self._memory_cache.move_to_end(key)
+                return embedding
+        
+        if self.cache_dir is None:
+            return None
+        try:
+            embedding = np.load(self.cache_dir / f"{key}.npy")
+        except (OSError, ValueError):
+            return None
+        self._remember(key, embedding)
+        return embedding
+    
+    def _cache_put(self, key: str, embedding: np.ndarray):
+        """Store a freshly encoded embedding in memory and on disk."""
+        self._remember(key, embedding)
+        if self.cache_dir is not None:
+            self._write_cache(key, embedding)
+    
+    def _remember(self, key: str, embedding: np.ndarray):
+        """Add an embedding to the in-memory LRU as a read-only copy, evicting the oldest entry."""
+        if self.memory_cache_size <= 0:
+            return
+        # Copy so a cached row does not pin the whole encoded batch in memory
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        with self._memory_cache_lock:
+            self._memory_cache[key] = embedding
+            if len(self._memory_cache) > self.memory_cache_size:
+                self._memory_cache.popitem(last=False)
+    
+    def _write_cache(self, key: str, embedding: np.ndarray):
+        """Persist one embedding atomically so concurrent readers never see a partial file."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, embedding)
+            os.replace(tmp_path, self.cache_dir / f"{key}.npy")
+        except OSError as e:
+            logger.warning(f"Could not write embedding cache entry {key}: {e}")
+    
+    def generate_single_embedding(self, text: str) -> np.ndarray:
+        """Generate embedding for a single text.
+        
+        Repeated texts such as the job description are served from the
+        in-memory cache. The returned array is read-only.
+        """
+        embedding = self._cache_get(self._cache_key(text))
+        if embedding is None:
+            embedding = self.generate_embeddings([text])[0]
+            embedding.setflags(write=False)
+        return embedding
     
     def get_model_info(self) -> dict:
         """Return model information."""
         return {
             "model_name": self.model_name,
+            "variant": self.variant,
             "embedding_dimension": self.model.get_sentence_embedding_dimension()
         }
+
+@lru_cache(maxsize=1)
+def get_embedding_manager() -> EmbeddingManager:
+    """Build the default EmbeddingManager on first use and share it, with its caches, afterwards."""
+    return EmbeddingManager()
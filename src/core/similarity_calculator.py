@@ -1,81 +1,223 @@
+import math
 import numpy as np
-from typing import List, Dict, Tuple
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import List, Dict, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+_sqrt = math.sqrt
+
+DEFAULT_SECTION_WEIGHTS = {
+    'skills': 0.35,
+    'experience': 0.30,
+    'education': 0.25,
+    'summary': 0.10
+}
+
+def unit_vector(vector: Union[List[float], np.ndarray]) -> np.ndarray:
+    """Return a float32 copy of the vector scaled to unit length; zero vectors stay zero."""
+    vec = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else vec
+
+def unit_rows(matrix: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+    """Return a float32 copy of the (N, dim) matrix with every row scaled to unit length."""
+    mat = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return mat / np.where(norms > 0, norms, 1.0)
+
+def _enhance_vec(raw: np.ndarray) -> np.ndarray:
+    """Vectorized enhance_similarity_score over an array of raw similarities."""
+    raw = np.asarray(raw, dtype=np.float64)
+    # np.select takes the first matching condition, mirroring the scalar if/elif ladder
+    return np.select(
+        [raw < 0.15, raw < 0.3, raw < 0.6],
+        [raw * 2, 0.3 + (raw - 0.15) * 2, 0.45 + (raw - 0.3) * 1.5],
+        0.9 + (raw - 0.6) * 0.25
+    )
+
+def _score_kernel_loop(raw: np.ndarray, weights: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Enhance raw section similarities, weight them and apply the final boost in one pass.
+    
+    Fuses enhance_similarity_score, the weighted sum and apply_final_score_boost;
+    keep it in sync with those methods.
+    """
+    enhanced = np.empty_like(raw)
+    total = 0.0
+    for i in range(raw.shape[0]):
+        r = raw[i]
+        if r < 0.15:
+            e = r * 2
+        elif r < 0.3:
+            e = 0.3 + (r - 0.15) * 2
+        elif r < 0.6:
+            e = 0.45 + (r - 0.3) * 1.5
+        else:
+            e = 0.9 + (r - 0.6) * 0.25
+        enhanced[i] = e
+        total += e * weights[i]
+    
+    total = max(total, 0.0)
+    boosted = math.sqrt(total) * 0.85 + total * 0.15
+    if boosted > 0.25:
+        boosted = boosted * 1.2
+    return min(1.0, boosted), enhanced
+
+def _score_kernel_numpy(raw: np.ndarray, weights: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Vectorized numpy equivalent of _score_kernel_loop for installs without numba."""
+    enhanced = _enhance_vec(raw)
+    total = max(float(enhanced @ weights), 0.0)
+    boosted = _sqrt(total) * 0.85 + total * 0.15
+    if boosted > 0.25:
+        boosted = boosted * 1.2
+    return min(1.0, boosted), enhanced
+
+_compiled_score_kernel = None
+
+def _score_kernel(raw: np.ndarray, weights: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Run the fused scoring kernel, resolving it on first use.
+    
+    numba is imported here rather than at module import, since the models import
+    this module and every page load would otherwise pay for loading llvmlite.
+    """
+    global _compiled_score_kernel
+    if _compiled_score_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:  # numba is optional; scoring falls back to numpy
+            _compiled_score_kernel = _score_kernel_numpy
+        else:
+            # Compiled to machine code; the interpreted loop would be slower than numpy
+            _compiled_score_kernel = njit(cache=True, fastmath=True)(_score_kernel_loop)
+    return _compiled_score_kernel(raw, weights)
+
+class PercentileRanker:
+    """Percentile ranks against a fixed score distribution, sorted once for binary search."""
+    
+    def __init__(self, all_scores: Union[List[float], np.ndarray]):
+        self._sorted = np.sort(np.asarray(all_scores, dtype=np.float64))
+    
+    def rank(self, score: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Percentage of scores less than or equal to score; accepts a scalar or an array of scores."""
+        if len(self._sorted) == 0:
+            return np.zeros_like(score, dtype=np.float64) if np.ndim(score) else 0.0
+        
+        ranks = np.searchsorted(self._sorted, score, side='right') / len(self._sorted) * 100
+        return ranks if np.ndim(score) else float(ranks)
+
 class SimilarityCalculator:
     """Calculates various similarity metrics for embeddings and text analysis."""
     
     def __init__(self):
         pass
     
-    def cosine_similarity_score(self, embedding1: List[float], embedding2: List[float]) -> float:
-        """Calculate cosine similarity between two embeddings."""
+    def cosine_similarity_score(self, embedding1: Union[List[float], np.ndarray],
+                                embedding2: Union[List[float], np.ndarray], normalized: bool = False) -> float:
+        """Calculate cosine similarity between two embeddings.
+        
+        Pass normalized=True when both embeddings are already unit length to skip the norms.
+        """
         try:
-            # Convert to numpy arrays
-            vec1 = np.array(embedding1).reshape(1, -1)
-            vec2 = np.array(embedding2).reshape(1, -1)
+            if normalized:
+                vec1 = np.asarray(embedding1, dtype=np.float32)
+                vec2 = np.asarray(embedding2, dtype=np.float32)
+            else:
+                vec1 = unit_vector(embedding1)
+                vec2 = unit_vector(embedding2)
             
-            # Calculate cosine similarity
-            similarity = cosine_similarity(vec1, vec2)[0][0]
-            return float(similarity)
+            # Cosine of unit vectors is their dot product; clip away float rounding past +/-1
+            return float(np.clip(np.dot(vec1, vec2), -1.0, 1.0))
         
         except Exception as e:
             logger.error(f"Error calculating cosine similarity: {e}")
             return 0.0
     
-    def batch_cosine_similarity(self, query_embedding: List[float], 
-                               candidate_embeddings: List[List[float]]) -> List[float]:
-        """Calculate cosine similarity between query and multiple candidate embeddings."""
+    def batch_cosine_similarity(self, query_embedding: Union[List[float], np.ndarray], 
+                               candidate_embeddings: Union[List[List[float]], np.ndarray],
+                               normalized: bool = False, dim_major: bool = False) -> List[float]:
+        """Calculate cosine similarity between query and multiple candidate embeddings.
+        
+        Pass normalized=True with a unit query and unit candidates to skip the norms. With
+        dim_major=True the candidates are a (dim, N) matrix such as
+        ResumeCollection.get_candidate_matrix_soa(); otherwise one candidate per row.
+        """
         try:
-            query_vec = np.array(query_embedding).reshape(1, -1)
-            candidate_matrix = np.array(candidate_embeddings)
+            query_vec = np.asarray(query_embedding, dtype=np.float32)
+            candidate_matrix = np.asarray(candidate_embeddings, dtype=np.float32)
+            if not normalized:
+                query_vec = unit_vector(query_vec)
+                candidate_matrix = unit_rows(candidate_matrix.T).T if dim_major else unit_rows(candidate_matrix)
             
-            similarities = cosine_similarity(query_vec, candidate_matrix)[0]
-            return similarities.tolist()
+            if dim_major:
+                similarities = query_vec @ candidate_matrix
+            else:
+                similarities = candidate_matrix @ query_vec
+            return np.clip(similarities, -1.0, 1.0).tolist()
         
         except Exception as e:
             logger.error(f"Error in batch cosine similarity calculation: {e}")
-            return [0.0] * len(candidate_embeddings)
+            return [0.0] * (np.shape(candidate_embeddings)[1] if dim_major else len(candidate_embeddings))
     
-    def weighted_similarity_score(self, job_embedding: List[float], 
-                                 resume_sections: Dict[str, List[float]], 
-                                 section_weights: Dict[str, float] = None) -> Tuple[float, Dict[str, float]]:
-        """Calculate weighted similarity score based on different resume sections."""
+    def weighted_similarity_score(self, job_embedding: Union[List[float], np.ndarray], 
+                                 resume_sections: Dict[str, np.ndarray], 
+                                 section_weights: Dict[str, float] = None,
+                                 normalized: bool = False) -> Tuple[float, Dict[str, float]]:
+        """Calculate weighted similarity score based on different resume sections.
         
+        Pass normalized=True when job_embedding is already unit length, e.g. JobDescription.unit_embedding.
+        """
         if section_weights is None:
-            section_weights = {
-                'skills': 0.35,
-                'experience': 0.30,
-                'education': 0.25,
-                'summary': 0.10
-            }
+            section_weights = DEFAULT_SECTION_WEIGHTS
         
-        total_score = 0.0
-        section_scores = {}
+        try:
+            section_keys = [section for section, embedding in resume_sections.items()
+                            if section in section_weights and embedding is not None]
+            if not section_keys:
+                return self.apply_final_score_boost(0.0), {}
+            
+            section_matrix = unit_rows(np.stack([resume_sections[section] for section in section_keys]))
+            return self.weighted_section_matrix_score(job_embedding, section_keys, section_matrix,
+                                                      section_weights, normalized)
+        
+        except Exception as e:
+            logger.error(f"Error calculating weighted similarity: {e}")
+            return 0.0, {}
+    
+    def weighted_section_matrix_score(self, job_embedding: Union[List[float], np.ndarray],
+                                      section_keys: List[str], section_matrix: np.ndarray,
+                                      section_weights: Dict[str, float] = None,
+                                      normalized: bool = False) -> Tuple[float, Dict[str, float]]:
+        """Calculate weighted similarity score from a (K, dim) matrix of unit section embeddings.
+        
+        Row i of section_matrix belongs to section_keys[i]; all sections are scored with one
+        matrix-vector product. Pass normalized=True when job_embedding is already unit length.
+        """
+        if section_weights is None:
+            section_weights = DEFAULT_SECTION_WEIGHTS
         
         try:
-            for section, embedding in resume_sections.items():
-                if section in section_weights and embedding:
-                    raw_similarity = self.cosine_similarity_score(job_embedding, embedding)
-
-                    enhanced_similarity = self.enhance_similarity_score(raw_similarity)
-                    weighted_score = enhanced_similarity * section_weights[section]
-                    total_score += weighted_score
-                    section_scores[section] = enhanced_similarity
+            # Sections without a weight do not contribute to the score
+            rows = [i for i, section in enumerate(section_keys) if section in section_weights]
+            if not rows:
+                return self.apply_final_score_boost(0.0), {}
+            keys = [section_keys[i] for i in rows]
             
-            final_score = self.apply_final_score_boost(total_score)
+            job_unit = np.asarray(job_embedding, dtype=np.float32) if normalized else unit_vector(job_embedding)
+            raw = np.clip(section_matrix[rows] @ job_unit, -1.0, 1.0).astype(np.float64)
+            weight_vec = np.array([section_weights[section] for section in keys], dtype=np.float64)
             
-            return final_score, section_scores
+            final_score, enhanced = _score_kernel(raw, weight_vec)
+            return float(final_score), dict(zip(keys, enhanced.tolist()))
         
         except Exception as e:
             logger.error(f"Error calculating weighted similarity: {e}")
             return 0.0, {}
         
     def enhance_similarity_score(self, raw_score: float) -> float:
-        """Enhance similarity score to be more generous and realistic."""
+        """Enhance similarity score to be more generous and realistic.
+        
+        Scalar counterpart of _enhance_vec; keep the two piecewise maps in sync.
+        """
         # Shift the scoring range to be more generous
         # Transform 0.2-0.8 range to 0.4-0.95 range
         
@@ -88,11 +230,11 @@ class SimilarityCalculator:
         else:
             return 0.9 + (raw_score - 0.6) * 0.25  # High scores get to near perfect
         
-    def apply_final_score_boost(self, score: float) -> float:
+    @staticmethod
+    def apply_final_score_boost(score: float) -> float:
         """Apply final boost to make scoring more realistic."""
         # Apply a square root transformation to boost lower scores more
-        import math
-        boosted = math.sqrt(score) * 0.85 + score * 0.15
+        boosted = _sqrt(score) * 0.85 + score * 0.15
         
         # Ensure minimum viable scores for decent matches
         if boosted > 0.25:
@@ -105,18 +247,18 @@ class SimilarityCalculator:
         if not scores or len(scores) == 1:
             return scores
         
-        min_score = min(scores)
-        max_score = max(scores)
+        arr = np.asarray(scores, dtype=np.float64)
+        score_range = np.ptp(arr)
         
-        if max_score == min_score:
+        if score_range == 0:
             return [1.0] * len(scores)
         
-        return [(score - min_score) / (max_score - min_score) for score in scores]
+        return ((arr - arr.min()) / score_range).tolist()
     
     def calculate_percentile_rank(self, score: float, all_scores: List[float]) -> float:
         """Calculate percentile rank of a score within a list of scores."""
-        if not all_scores:
-            return 0.0
-        
-        rank = sum(1 for s in all_scores if s <= score)
-        return (rank / len(all_scores)) * 100
+        return self.percentile_ranker(all_scores).rank(score)
+    
+    def percentile_ranker(self, all_scores: List[float]) -> PercentileRanker:
+        """Build a ranker for scoring many values against the same distribution."""
+        return PercentileRanker(all_scores)
@@ -1,7 +1,7 @@
-import chromadb
-from chromadb.config import Settings as ChromaSettings
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import logging
+from functools import lru_cache
+import numpy as np
 import uuid
 from pathlib import Path
 
@@ -15,10 +15,13 @@ class VectorStoreManager:
         self.collection_name = collection_name
         self.client = None
         self.collection = None
+        self._count_cache: Optional[int] = None
         self._initialize_client()
     
     def _initialize_client(self):
         """Initialize ChromaDB client and collection."""
+        import chromadb
+        
         try:
             # Create persistence directory if it doesn't exist
             self.persist_directory.mkdir(parents=True, exist_ok=True)
@@ -31,31 +34,87 @@ class VectorStoreManager:
                 self.collection = self.client.get_collection(name=self.collection_name)
                 logger.info(f"Loaded existing collection: {self.collection_name}")
             except:
-                self.collection = self.client.create_collection(
-                    name=self.collection_name,
-                    metadata={"description": "Resume embeddings for screening"}
-                )
+                self.collection = self._create_collection()
                 logger.info(f"Created new collection: {self.collection_name}")
         
         except Exception as e:
             logger.error(f"Failed to initialize ChromaDB: {e}")
             raise
     
-    def add_documents(self, documents: List[str], embeddings: List[List[float]], 
-                     metadata: List[Dict], ids: Optional[List[str]] = None) -> List[str]:
-        """Add documents with embeddings to the vector store."""
+    def _create_collection(self, dimension: Optional[int] = None):
+        """Create the collection with an HNSW index over cosine distance."""
+        metadata = {"description": "Resume embeddings for screening", "hnsw:space": "cosine"}
+        if dimension is not None:
+            metadata["dimension"] = int(dimension)
+        return self.client.create_collection(name=self.collection_name, metadata=metadata)
+    
+    def _stored_dimension(self) -> Optional[int]:
+        """Embedding dimension the collection's index was built for, if known."""
+        dimension = (self.collection.metadata or {}).get("dimension")
+        if dimension is None:
+            # Collections created before the dimension was recorded: sample a row
+            sample = self.collection.get(limit=1, include=["embeddings"])["embeddings"]
+            if sample is not None and len(sample):
+                dimension = len(sample[0])
+        return dimension
+    
+    def _ensure_dimension(self, dimension: int):
+        """Recreate the collection when its index was built for another embedding size."""
+        stored = self._stored_dimension()
+        if stored == dimension:
+            return
+        # The HNSW index keeps its dimension after rows are deleted, so switching to a
+        # model preset of another size would make every later insert fail
+        if stored is not None:
+            logger.warning(f"Recreating collection: index dimension {stored} != embedding dimension {dimension}")
+        self.client.delete_collection(name=self.collection_name)
+        self.collection = self._create_collection(dimension)
+    
+    @property
+    def distance_space(self) -> str:
+        """Distance function of the collection's index; collections created before cosine use l2."""
+        return (self.collection.metadata or {}).get("hnsw:space", "l2")
+    
+    def _distances_to_scores(self, distances: List[float]) -> List[float]:
+        """Convert ChromaDB distances to similarity scores."""
+        distances = np.asarray(distances, dtype=np.float64)
+        if self.distance_space in ("cosine", "ip"):
+            # Cosine distance is 1 - cosine similarity
+            return (1.0 - distances).tolist()
+        return (1.0 / (1.0 + distances)).tolist()
+    
+    def add_documents(self, documents: Optional[List[str]], embeddings: np.ndarray, 
+                     metadata: List[Dict], ids: Optional[List[str]] = None,
+                     batch_size: int = 512) -> List[str]:
+        """Add documents with embeddings to the vector store in batches of batch_size.
+        
+        Pass documents=None to store only embeddings, metadata and ids.
+        """
         try:
+            # Convert once; each batch below is a zero-copy row slice
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            
             if ids is None:
-                ids = [str(uuid.uuid4()) for _ in documents]
+                ids = [str(uuid.uuid4()) for _ in range(len(embeddings))]
             
-            self.collection.add(
-                documents=documents,
-                embeddings=embeddings,
-                metadatas=metadata,
-                ids=ids
-            )
+            # Reset before inserting: batches committed before a failing one still change the count
+            self._count_cache = None
+            
+            if len(embeddings):
+                self._ensure_dimension(embeddings.shape[1])
             
-            logger.info(f"Added {len(documents)} documents to vector store")
+            # Bounded inserts keep peak memory flat instead of one transaction for the whole set
+            for start in range(0, len(embeddings), batch_size):
+                end = start + batch_size
+                # ChromaDB validates embeddings as plain Python lists of floats
+                self.collection.add(
+                    documents=documents[start:end] if documents is not None else None,
+                    embeddings=embeddings[start:end].tolist(),
+                    metadatas=metadata[start:end],
+                    ids=ids[start:end]
+                )
+            
+            logger.info(f"Added {len(embeddings)} documents to vector store")
             return ids
             
         except Exception as e:
@@ -64,11 +123,16 @@ class VectorStoreManager:
     
     def similarity_search(self, query_embedding: List[float], 
                          top_k: int = 5, 
-                         metadata_filter: Optional[Dict] = None) -> Tuple[List[str], List[float], List[Dict]]:
-        """Perform similarity search and return documents with scores."""
+                         metadata_filter: Optional[Dict] = None,
+                         return_scores: bool = True) -> Tuple[List[str], Union[List[float], np.ndarray], List[Dict]]:
+        """Perform similarity search and return documents with scores.
+        
+        Results are ordered best first. With return_scores=False the raw distances are
+        returned as an array instead, for callers that only need the ranking.
+        """
         try:
             results = self.collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=[np.asarray(query_embedding, dtype=np.float32).tolist()],
                 n_results=top_k,
                 where=metadata_filter
             )
@@ -77,8 +141,10 @@ class VectorStoreManager:
             distances = results['distances'][0] if results['distances'] else []
             metadatas = results['metadatas'][0] if results['metadatas'] else []
             
-            # Convert distances to similarity scores (ChromaDB returns L2 distances)
-            similarity_scores = [1 / (1 + distance) for distance in distances]
+            if not return_scores:
+                return documents, np.asarray(distances, dtype=np.float64), metadatas
+            
+            similarity_scores = self._distances_to_scores(distances)
             
             return documents, similarity_scores, metadatas
             
@@ -91,7 +157,7 @@ class VectorStoreManager:
         """Perform batch similarity search for multiple queries."""
         try:
             results = self.collection.query(
-                query_embeddings=query_embeddings,
+                query_embeddings=np.asarray(query_embeddings, dtype=np.float32).tolist(),
                 n_results=top_k
             )
             
@@ -101,7 +167,7 @@ class VectorStoreManager:
                 distances = results['distances'][i] if i < len(results['distances']) else []
                 metadatas = results['metadatas'][i] if i < len(results['metadatas']) else []
                 
-                similarity_scores = [1 / (1 + distance) for distance in distances]
+                similarity_scores = self._distances_to_scores(distances)
                 batch_results.append((documents, similarity_scores, metadatas))
             
             return batch_results
@@ -113,7 +179,10 @@ class VectorStoreManager:
     def get_collection_count(self) -> int:
         """Get the number of documents in the collection."""
         try:
-            return self.collection.count()
+            # Cached until the next add or clear to skip a SQLite round trip per call
+            if self._count_cache is None:
+                self._count_cache = self.collection.count()
+            return self._count_cache
         except Exception as e:
             logger.error(f"Error getting collection count: {e}")
             return 0
@@ -121,12 +190,29 @@ class VectorStoreManager:
     def clear_collection(self):
         """Clear all documents from the collection."""
         try:
+            self._count_cache = None
+            if self.distance_space == "cosine":
+                # Deleting rows keeps the collection and its index configuration,
+                # avoiding the file churn of dropping and recreating it
+                try:
+                    ids = self.collection.get(include=[])["ids"]
+                    if ids:
+                        self.collection.delete(ids=ids)
+                    logger.info("Collection cleared successfully")
+                    return
+                except Exception as e:
+                    logger.warning(f"Falling back to recreating the collection: {e}")
+            
+            # Legacy l2 collections are recreated so the index moves to cosine space
+            dimension = (self.collection.metadata or {}).get("dimension")
             self.client.delete_collection(name=self.collection_name)
-            self.collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={"description": "Resume embeddings for screening"}
-            )
+            self.collection = self._create_collection(dimension)
             logger.info("Collection cleared successfully")
         except Exception as e:
             logger.error(f"Error clearing collection: {e}")
             raise
+
+@lru_cache(maxsize=1)
+def get_vector_store() -> VectorStoreManager:
+    """Open the default vector store on first use and share the client afterwards."""
+    return VectorStoreManager()
@@ -1,7 +1,17 @@
+import math
 from dataclasses import dataclass
 from typing import List, Dict, Optional
 from datetime import datetime
 
+# Letter grade per 10-point percentage band: <50 F, 50s D, 60s C, 70s B, 80+ A
+_GRADE_BY_DECILE = ('F', 'F', 'F', 'F', 'F', 'D', 'C', 'B', 'A', 'A', 'A')
+
+def _grade_from_percentage(score_pct: float) -> str:
+    """Look up the letter grade for a percentage score."""
+    if not math.isfinite(score_pct):
+        return 'F'  # NaN scores, e.g. from a zero-norm embedding, grade as no match
+    return _GRADE_BY_DECILE[min(10, max(0, int(score_pct // 10)))]
+
 @dataclass
 class SimilarityScore:
     """Model for similarity score details."""
@@ -11,23 +21,21 @@ class SimilarityScore:
     confidence: float
     reasoning: str
     
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name == "overall_score":
+            # Percentage and grade are serialized per candidate; derive them once per score
+            percentage = round(value * 100, 2)
+            super().__setattr__("_percentage", percentage)
+            super().__setattr__("_grade", _grade_from_percentage(percentage))
+    
     def get_score_percentage(self) -> float:
         """Get score as percentage."""
-        return round(self.overall_score * 100, 2)
+        return self._percentage
     
     def get_grade(self) -> str:
         """Get letter grade based on score."""
-        score_pct = self.get_score_percentage()
-        if score_pct >= 80:
-            return "A"
-        elif score_pct >= 70:
-            return "B"
-        elif score_pct >= 60:
-            return "C"
-        elif score_pct >= 50:
-            return "D"
-        else:
-            return "F"
+        return self._grade
 
 @dataclass
 class SingleAnalysisResult:
@@ -64,6 +72,9 @@ class SingleAnalysisResult:
             "analysis_timestamp": self.analysis_timestamp.isoformat()
         }
 
+# Field order of CandidateRanking.to_tuple() and the columns of BatchAnalysisResult.to_columns()
+_RANKING_KEYS = ("rank", "resume_id", "candidate_name", "overall_score", "percentage", "grade", "key_highlights")
+
 @dataclass
 class CandidateRanking:
     """Model for candidate ranking in batch mode."""
@@ -76,17 +87,24 @@ class CandidateRanking:
     
     def to_dict(self) -> Dict:
         """Convert to dictionary representation."""
+        score = self.similarity_score
         return {
             "rank": self.rank,
             "resume_id": self.resume_id,
             "candidate_name": self.candidate_name,
             "similarity_score": {
-                "overall_score": self.similarity_score.overall_score,
-                "percentage": self.similarity_score.get_score_percentage(),
-                "grade": self.similarity_score.get_grade()
+                "overall_score": score.overall_score,
+                "percentage": score.get_score_percentage(),
+                "grade": score.get_grade()
             },
             "key_highlights": self.key_highlights
         }
+    
+    def to_tuple(self) -> tuple:
+        """Convert to a flat tuple ordered as _RANKING_KEYS."""
+        score = self.similarity_score
+        return (self.rank, self.resume_id, self.candidate_name, score.overall_score,
+                score.get_score_percentage(), score.get_grade(), self.key_highlights)
 
 @dataclass
 class BatchAnalysisResult:
@@ -109,11 +127,36 @@ class BatchAnalysisResult:
     
     def to_dict(self) -> Dict:
         """Convert to dictionary representation."""
+        data = self._to_primitive_dict()
+        data["analysis_timestamp"] = self.analysis_timestamp.isoformat()
+        return data
+    
+    def to_json_bytes(self, indent: bool = False) -> bytes:
+        """Serialize the to_dict() document to UTF-8 JSON with orjson."""
+        import orjson
+        
+        # orjson writes datetimes and numpy scalars natively, so no isoformat or float() pass is needed
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(self._to_primitive_dict(), option=option)
+    
+    def _to_primitive_dict(self) -> Dict:
+        """Build the dictionary representation with the timestamp left as a datetime."""
         return {
             "job_description_id": self.job_description_id,
             "total_candidates": self.total_candidates,
             "top_n_requested": self.top_n_requested,
             "rankings": [ranking.to_dict() for ranking in self.rankings],
             "analysis_summary": self.analysis_summary,
-            "analysis_timestamp": self.analysis_timestamp.isoformat()
-        }
\ No newline at end of file
+            "analysis_timestamp": self.analysis_timestamp
+        }
+    
+    def to_columns(self) -> Dict[str, list]:
+        """Convert rankings to parallel per-field lists keyed by _RANKING_KEYS.
+        
+        One list per field instead of one dict per candidate; loads directly
+        into pandas.DataFrame or pyarrow.table.
+        """
+        rows = [ranking.to_tuple() for ranking in self.rankings]
+        if not rows:
+            return {key: [] for key in _RANKING_KEYS}
+        return {key: list(column) for key, column in zip(_RANKING_KEYS, zip(*rows))}
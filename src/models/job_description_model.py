@@ -1,6 +1,9 @@
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
+import numpy as np
+
+from src.core.similarity_calculator import unit_vector
 
 @dataclass
 class JobDescription:
@@ -11,25 +14,66 @@ class JobDescription:
     content: str
     sections: Dict[str, str]
     requirements: List[str]
-    embedding: Optional[List[float]] = None
+    embedding: Optional[np.ndarray] = None
     created_at: Optional[datetime] = None
     
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now()
+        self._requirements_source: Optional[str] = None
+        self._requirements_cache: List[str] = []
+        self._lower_source: Optional[str] = None
+        self._content_lower = ""
+    
+    def __setattr__(self, name, value):
+        if name == "embedding" and value is not None:
+            # Stored as a float32 array (4 bytes per dimension) instead of boxed Python floats
+            value = np.asarray(value, dtype=np.float32)
+        super().__setattr__(name, value)
+        if name == "embedding":
+            # Normalize once on assignment so cosine similarity reduces to a dot product
+            super().__setattr__("_unit", None if value is None else unit_vector(value))
+            # Remember which text the embedding describes so a content edit invalidates it
+            super().__setattr__("_embedded_content", getattr(self, "content", None))
+    
+    @property
+    def unit_embedding(self) -> Optional[np.ndarray]:
+        """Get the L2-normalized embedding."""
+        return self._unit
+    
+    def get_unit_embedding(self, embed: Callable[[str], np.ndarray]) -> np.ndarray:
+        """Get the unit embedding, calling embed(content) only if it is missing or content changed."""
+        if self._unit is None or self.content is not self._embedded_content:
+            self.embedding = embed(self.content)
+        return self._unit
+    
+    @property
+    def content_lower(self) -> str:
+        """Get the lowercased content, recomputed only when content is replaced."""
+        if self.content is not self._lower_source:
+            self._content_lower = self.content.lower()
+            self._lower_source = self.content
+        return self._content_lower
     
     def get_section_content(self, section: str) -> str:
         """Get content of a specific section."""
         return self.sections.get(section, "")
     
     def extract_requirements(self) -> List[str]:
-        """Extract key requirements from job description."""
+        """Extract key requirements from job description.
+        
+        The parsed list is cached and shared between calls; do not mutate it.
+        """
         # This could be enhanced with NLP techniques
         req_section = self.get_section_content('requirements')
         if req_section:
-            # Simple extraction by splitting on common delimiters
-            requirements = [req.strip() for req in req_section.split('\n') if req.strip()]
-            return [req for req in requirements if len(req) > 10]  # Filter short items
+            # Parsed once per requirements text; an edited section is a new string and re-parses
+            if req_section is not self._requirements_source:
+                # Simple extraction by splitting on common delimiters
+                requirements = [req.strip() for req in req_section.split('\n') if req.strip()]
+                self._requirements_cache = [req for req in requirements if len(req) > 10]  # Filter short items
+                self._requirements_source = req_section
+            return self._requirements_cache
         return self.requirements
     
     def to_dict(self) -> Dict:
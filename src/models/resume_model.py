@@ -1,6 +1,9 @@
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+import numpy as np
+
+from src.core.similarity_calculator import unit_vector, unit_rows
 
 @dataclass
 class ResumeDocument:
@@ -11,12 +14,46 @@ class ResumeDocument:
     content: str
     sections: Dict[str, str]
     metadata: Dict
-    embedding: Optional[List[float]] = None
+    embedding: Optional[np.ndarray] = None
     processed_at: Optional[datetime] = None
     
     def __post_init__(self):
         if self.processed_at is None:
             self.processed_at = datetime.now()
+        self.section_keys: List[str] = []
+        self.section_matrix: Optional[np.ndarray] = None
+        self._lower_source: Optional[str] = None
+        self._content_lower = ""
+    
+    def __setattr__(self, name, value):
+        if name == "embedding" and value is not None:
+            # Stored as a float32 array (4 bytes per dimension) instead of boxed Python floats
+            value = np.asarray(value, dtype=np.float32)
+        super().__setattr__(name, value)
+        if name == "embedding":
+            # Normalize once on assignment so cosine similarity reduces to a dot product
+            super().__setattr__("_unit", None if value is None else unit_vector(value))
+    
+    @property
+    def unit_embedding(self) -> Optional[np.ndarray]:
+        """Get the L2-normalized embedding."""
+        return self._unit
+    
+    @property
+    def content_lower(self) -> str:
+        """Get the lowercased content, recomputed only when content is replaced."""
+        if self.content is not self._lower_source:
+            self._content_lower = self.content.lower()
+            self._lower_source = self.content
+        return self._content_lower
+    
+    def set_section_embeddings(self, section_embeddings: Dict[str, np.ndarray]):
+        """Store section embeddings as a (K, dim) unit matrix with row keys in section_keys."""
+        self.section_keys = list(section_embeddings)
+        self.section_matrix = (
+            np.ascontiguousarray(unit_rows(np.stack(list(section_embeddings.values()))))
+            if section_embeddings else None
+        )
     
     def get_section_content(self, section: str) -> str:
         """Get content of a specific section."""
@@ -48,14 +85,84 @@ class ResumeCollection:
     def __post_init__(self):
         if not hasattr(self, 'created_at') or self.created_at is None:
             self.created_at = datetime.now()
+        self._id_index: Dict[str, ResumeDocument] = {}
+        self._indexed_count = 0
+        # Numeric mirror of the resume list: unit embeddings packed row by row into a
+        # contiguous buffer that grows geometrically, with _embedded_resumes aligned to its rows
+        self._embedding_buffer: Optional[np.ndarray] = None
+        self._embedded_resumes: List[ResumeDocument] = []
+        self._scanned_count = 0
+        self._unembedded_idx: List[int] = []
+        self._candidate_matrix_soa: Optional[np.ndarray] = None
     
     def add_resume(self, resume: ResumeDocument):
         """Add a resume to the collection."""
         self.resumes.append(resume)
     
+    def _sync_embeddings(self):
+        """Append unit embeddings of resumes added or embedded since the last sync to the buffer."""
+        candidates = self._unembedded_idx + list(range(self._scanned_count, len(self.resumes)))
+        self._scanned_count = len(self.resumes)
+        self._unembedded_idx = []
+        
+        for idx in candidates:
+            unit = self.resumes[idx].unit_embedding
+            if unit is None:
+                # Resumes are often embedded after joining the collection; check again next sync
+                self._unembedded_idx.append(idx)
+                continue
+            
+            row = len(self._embedded_resumes)
+            if self._embedding_buffer is None or row == len(self._embedding_buffer):
+                buffer = np.empty((max(64, 2 * row), unit.shape[0]), dtype=np.float32)
+                if row:
+                    buffer[:row] = self._embedding_buffer
+                self._embedding_buffer = buffer
+            self._embedding_buffer[row] = unit
+            self._embedded_resumes.append(self.resumes[idx])
+            self._candidate_matrix_soa = None
+    
+    @property
+    def embedding_matrix(self) -> np.ndarray:
+        """Unit embeddings of the embedded resumes as a C-contiguous (N, dim) float32 view."""
+        self._sync_embeddings()
+        if self._embedding_buffer is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._embedding_buffer[:len(self._embedded_resumes)]
+    
+    def get_embedding_matrix(self) -> Tuple[List[ResumeDocument], np.ndarray]:
+        """Get the embedded resumes and their unit embeddings as an (N, dim) float32 matrix.
+        
+        Rows are appended as resumes gain embeddings; replacing an embedding that
+        is already in the matrix is not picked up.
+        """
+        matrix = self.embedding_matrix
+        return self._embedded_resumes, matrix
+    
+    def get_candidate_matrix_soa(self) -> Tuple[List[ResumeDocument], np.ndarray]:
+        """Get the embedded resumes and their unit embeddings as a dimension-major (dim, N) float32 matrix.
+        
+        A query is scored as query @ matrix, accumulating all N candidates across contiguous rows.
+        """
+        resumes, matrix = self.get_embedding_matrix()
+        if self._candidate_matrix_soa is None:
+            self._candidate_matrix_soa = np.ascontiguousarray(matrix.T)
+        return resumes, self._candidate_matrix_soa
+    
+    @property
+    def id_index(self) -> Dict[str, ResumeDocument]:
+        """Mapping of resume ID to resume, for callers doing many lookups; do not mutate it."""
+        # Index resumes appended since the last lookup, whether through add_resume or
+        # directly on the list; setdefault keeps the first resume for a repeated ID
+        if self._indexed_count < len(self.resumes):
+            for resume in self.resumes[self._indexed_count:]:
+                self._id_index.setdefault(resume.id, resume)
+            self._indexed_count = len(self.resumes)
+        return self._id_index
+    
     def get_resume_by_id(self, resume_id: str) -> Optional[ResumeDocument]:
         """Get resume by ID."""
-        return next((r for r in self.resumes if r.id == resume_id), None)
+        return self.id_index.get(resume_id)
     
     def get_resume_count(self) -> int:
         """Get total number of resumes."""
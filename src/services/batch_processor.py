@@ -1,13 +1,23 @@
 from typing import List, Dict, Optional, Tuple
+import asyncio
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import secrets
 import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
 
-from src.core.document_processor import DocumentProcessor
-from src.core.embedding_manager import EmbeddingManager
-from src.core.vector_store import VectorStoreManager
+try:
+    from numba import vectorize
+except ImportError:  # numba is optional; batch enhancement falls back to numpy
+    vectorize = None
+
+from config.settings import get_settings
+from src.core.document_processor import get_document_processor
+from src.core.embedding_manager import get_embedding_manager
+from src.core.vector_store import get_vector_store
 from src.core.similarity_calculator import SimilarityCalculator
 from src.models.resume_model import ResumeDocument, ResumeCollection
 from src.models.job_description_model import JobDescription
@@ -15,13 +25,54 @@ from src.models.analysis_result import BatchAnalysisResult, CandidateRanking, Si
 
 logger = logging.getLogger(__name__)
 
+# Longest the embedding stage waits (seconds) to fill a batch of EMBEDDING_BATCH_SIZE resumes
+EMBED_BATCH_WAIT = 0.1
+
+# Sections encoded per model call when scoring candidates; scoring of one chunk overlaps encoding the next
+SECTION_SCORE_CHUNK = 256
+
+# Score distribution bucket edges: poor < 0.5 <= fair < 0.65 <= good <= 0.8 < excellent
+# (histogram bins are half-open, so the good/excellent edge sits just above 0.8)
+_SCORE_BUCKET_EDGES = np.array([-np.inf, 0.5, 0.65, np.nextafter(0.8, np.inf), np.inf])
+
+# Mentions of years ("5 years", "one year") taken as evidence of work experience
+_EXPERIENCE_RE = re.compile(r"\byears?\b", re.IGNORECASE)
+
+def _enhance_batch_score(raw_score: float) -> float:
+    """Apply generous score enhancement for batch processing."""
+    # More generous than single analysis - recruiters want to see potential
+    if raw_score < 0.2:
+        return raw_score * 1.5  # Slight boost for very low scores
+    elif raw_score < 0.4:
+        return 0.35 + (raw_score - 0.2) * 2.0  # Significant boost for low-medium
+    elif raw_score < 0.6:
+        return 0.65 + (raw_score - 0.4) * 1.25  # Good boost for medium scores
+    else:
+        return 0.85 + (raw_score - 0.6) * 0.375  # High scores reach 95%+
+
+def _enhance_batch_numpy(raw: np.ndarray) -> np.ndarray:
+    """Vectorized numpy equivalent of _enhance_batch_score for installs without numba."""
+    raw = np.asarray(raw, dtype=np.float64)
+    return np.select(
+        [raw < 0.2, raw < 0.4, raw < 0.6],
+        [raw * 1.5, 0.35 + (raw - 0.2) * 2.0, 0.65 + (raw - 0.4) * 1.25],
+        0.85 + (raw - 0.6) * 0.375
+    )
+
+# Compiled into a ufunc when numba is installed, so every candidate's score is enhanced in one call
+_enhance_batch_scores = (
+    vectorize(["float64(float64)"], cache=True)(_enhance_batch_score) if vectorize else _enhance_batch_numpy
+)
+
 class BatchProcessor:
     """Service for processing multiple resumes in batch mode."""
     
-    def __init__(self, max_workers: int = 4):
-        self.document_processor = DocumentProcessor()
-        self.embedding_manager = EmbeddingManager()
-        self.vector_store = VectorStoreManager()
+    def __init__(self, max_workers: Optional[int] = None):
+        # Batch ranking embeds whole resumes, so chunking would only be rejoined
+        # Heavy components are process-wide singletons shared with single-resume analysis
+        self.document_processor = get_document_processor(enable_splitting=False)
+        self.embedding_manager = get_embedding_manager()
+        self.vector_store = get_vector_store() if get_settings().USE_CHROMA_FOR_BATCH else None
         self.similarity_calculator = SimilarityCalculator()
         self.max_workers = max_workers
     
@@ -30,15 +81,34 @@ class BatchProcessor:
         """Process multiple resumes and return ranked results."""
         try:
             logger.info(f"Processing batch of {len(resume_paths)} resumes")
+            settings = get_settings()
+            
+            # Cheap lexical cascade: when the batch is much larger than the shortlist,
+            # only the best TF-IDF matches are sent through the transformer
+            prefilter_keep = settings.PREFILTER_MULTIPLIER * top_n
+            use_prefilter = settings.PREFILTER_MULTIPLIER > 0 and len(resume_paths) > prefilter_keep
             
             # Process all resumes
-            resume_collection = self._process_resume_batch(resume_paths)
+            resume_collection = self._process_resume_batch(resume_paths, embed=not use_prefilter)
+            if use_prefilter:
+                shortlisted = self._prefilter_resumes(resume_collection.resumes, job_description, prefilter_keep)
+                self._embed_resumes(shortlisted)
             
-            # Store in vector database for efficient similarity search
-            self._index_resumes_in_vector_store(resume_collection)
+            # Snapshot the embedded resumes and their matrices once on this thread; the
+            # collection syncs them without a lock, so neither stage below touches it
+            resumes, embeddings = resume_collection.get_embedding_matrix()
+            resumes = list(resumes)
+            _, candidate_matrix = resume_collection.get_candidate_matrix_soa()
             
-            # Calculate similarities and rank candidates
-            rankings = self._rank_candidates(resume_collection, job_description, top_n)
+            # Calculate similarities and rank candidates in memory; persisting the batch
+            # to the vector database runs alongside instead of in front of ranking
+            if settings.USE_CHROMA_FOR_BATCH:
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    indexing = executor.submit(self._index_resumes_in_vector_store, resumes, embeddings)
+                    rankings = self._rank_candidates(resumes, candidate_matrix, job_description, top_n)
+                    indexing.result()
+            else:
+                rankings = self._rank_candidates(resumes, candidate_matrix, job_description, top_n)
             
             # Generate analysis summary
             analysis_summary = self._generate_batch_summary(rankings, len(resume_paths))
@@ -56,26 +126,9 @@ class BatchProcessor:
             logger.error(f"Error in batch processing: {e}")
             raise
     
-    def _process_resume_batch(self, resume_paths: List[str]) -> ResumeCollection:
-        """Process multiple resumes in parallel."""
-        resumes = []
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all resume processing tasks
-            future_to_path = {
-                executor.submit(self._process_single_resume, path): path 
-                for path in resume_paths
-            }
-            
-            # Collect results
-            for future in as_completed(future_to_path):
-                path = future_to_path[future]
-                try:
-                    resume_doc = future.result()
-                    if resume_doc:
-                        resumes.append(resume_doc)
-                except Exception as e:
-                    logger.error(f"Error processing {path}: {e}")
+    def _process_resume_batch(self, resume_paths: List[str], embed: bool = True) -> ResumeCollection:
+        """Parse, section and (optionally) embed multiple resumes as an overlapping pipeline."""
+        resumes = asyncio.run(self._run_resume_pipeline(resume_paths, embed))
         
         return ResumeCollection(
             resumes=resumes,
@@ -83,113 +136,226 @@ class BatchProcessor:
             metadata={"batch_size": len(resume_paths), "processed_count": len(resumes)}
         )
     
-    def _process_single_resume(self, file_path: str) -> Optional[ResumeDocument]:
-        """Process a single resume file."""
+    async def _run_resume_pipeline(self, resume_paths: List[str], embed: bool = True) -> List[ResumeDocument]:
+        """Run parse -> embed stages connected by a bounded queue.
+        
+        Worker processes parse and section the PDFs while the model encodes the
+        resumes already parsed, so wall time approaches the slower stage instead
+        of the sum of both.
+        """
+        loop = asyncio.get_running_loop()
+        embed_batch_size = get_settings().EMBEDDING_BATCH_SIZE
+        parsed_queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+        stop_parsing = threading.Event()
+        resumes: List[ResumeDocument] = []
+        
+        def parse():
+            # Runs in a helper thread; PDFs are parsed and sectioned in worker processes
+            parsed_items = self.document_processor.iter_resumes_parallel(resume_paths, self.max_workers)
+            try:
+                for item in parsed_items:
+                    if stop_parsing.is_set():
+                        break
+                    asyncio.run_coroutine_threadsafe(parsed_queue.put(item), loop).result()
+            finally:
+                parsed_items.close()
+                if not stop_parsing.is_set():
+                    asyncio.run_coroutine_threadsafe(parsed_queue.put(None), loop).result()
+        
+        async def embed_stage():
+            finished = False
+            while not finished:
+                first = await parsed_queue.get()
+                if first is None:
+                    break
+                
+                # Drain up to one model batch of resumes, waiting at most EMBED_BATCH_WAIT
+                items = [first]
+                deadline = loop.time() + EMBED_BATCH_WAIT
+                while len(items) < embed_batch_size:
+                    try:
+                        item = await asyncio.wait_for(parsed_queue.get(), max(0.0, deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        finished = True
+                        break
+                    items.append(item)
+                
+                # Files that failed to parse arrive with None in place of (content, sections)
+                batch = [resume_doc for resume_doc in (self._process_single_resume(file_path, parsed)
+                                                       for file_path, parsed in items if parsed is not None)
+                         if resume_doc]
+                if not embed:
+                    resumes.extend(batch)
+                    continue
+                if not batch:
+                    continue
+                try:
+                    embeddings = await loop.run_in_executor(
+                        None, self.embedding_manager.generate_embeddings, [r.content for r in batch]
+                    )
+                except Exception as e:
+                    logger.error(f"Error embedding batch of {len(batch)} resumes: {e}")
+                    continue
+                for resume_doc, embedding in zip(batch, embeddings):
+                    resume_doc.embedding = embedding
+                    resumes.append(resume_doc)
+        
+        producer = loop.run_in_executor(None, parse)
         try:
-            # Load and process document
-            documents = self.document_processor.load_pdf(file_path)
-            full_content = "\n".join([doc.page_content for doc in documents])
-            
-            # Extract sections
-            sections = self.document_processor.extract_key_sections(full_content)
-            
-            # Generate embedding for full content
-            embedding = self.embedding_manager.generate_single_embedding(full_content)
+            await embed_stage()
+        finally:
+            # If embedding stopped early, release a producer blocked on the full queue
+            # so the helper thread (and its worker processes) can shut down
+            stop_parsing.set()
+            while not producer.done():
+                while not parsed_queue.empty():
+                    parsed_queue.get_nowait()
+                await asyncio.wait([producer], timeout=EMBED_BATCH_WAIT)
+        # Surface parsing errors once both stages have stopped
+        await producer
+        return resumes
+    
+    def _prefilter_resumes(self, resumes: List[ResumeDocument], job_description: JobDescription,
+                           keep: int) -> List[ResumeDocument]:
+        """Shortlist the resumes with the highest TF-IDF cosine similarity to the job description."""
+        if len(resumes) <= keep:
+            return resumes
+        
+        try:
+            vectorizer = TfidfVectorizer(max_features=20000, ngram_range=(1, 2))
+            tfidf = vectorizer.fit_transform([job_description.content] + [r.content for r in resumes])
+        except ValueError as e:
+            # Raised when no document contains a usable term
+            logger.warning(f"Skipping TF-IDF prefilter: {e}")
+            return resumes
+        
+        # TF-IDF rows are L2-normalized, so the sparse dot product is the cosine
+        scores = (tfidf[1:] @ tfidf[0].T).toarray().ravel()
+        top_idx = np.argpartition(-scores, keep - 1)[:keep]
+        logger.info(f"TF-IDF prefilter kept {keep} of {len(resumes)} resumes")
+        return [resumes[idx] for idx in sorted(top_idx)]
+    
+    def _embed_resumes(self, resumes: List[ResumeDocument]):
+        """Embed resumes in one batched model call."""
+        if not resumes:
+            return
+        embeddings = self.embedding_manager.generate_embeddings([r.content for r in resumes])
+        for resume_doc, embedding in zip(resumes, embeddings):
+            resume_doc.embedding = embedding
+    
+    def _process_single_resume(self, file_path: str,
+                               parsed: Optional[Tuple[str, Dict[str, str]]] = None) -> Optional[ResumeDocument]:
+        """Build a resume document with extracted sections; the embedding is added by the pipeline."""
+        try:
+            # Load the document and extract sections unless a worker already did
+            if parsed is None:
+                parsed = self.document_processor.parse_resume(file_path)
+            full_content, sections = parsed
             
             return ResumeDocument(
-                id=str(uuid.uuid4()),
+                id=secrets.token_hex(16),
                 file_path=file_path,
                 content=full_content,
                 sections=sections,
-                metadata={"source": file_path, "type": "resume"},
-                embedding=embedding
+                metadata={"source": file_path, "type": "resume"}
             )
         
         except Exception as e:
             logger.error(f"Error processing resume {file_path}: {e}")
             return None
     
-    def _index_resumes_in_vector_store(self, resume_collection: ResumeCollection):
-        """Index all resumes in the vector store for efficient similarity search."""
+    def _index_resumes_in_vector_store(self, resumes: List[ResumeDocument], embeddings: np.ndarray):
+        """Persist embedded resumes and their (N, dim) unit embeddings for cross-session search."""
         try:
             # Clear existing collection
             self.vector_store.clear_collection()
             
-            # Prepare data for indexing
-            documents = []
-            embeddings = []
-            metadata = []
-            ids = []
-            
-            for resume in resume_collection.resumes:
-                if resume.embedding:
-                    documents.append(resume.content)
-                    embeddings.append(resume.embedding)
-                    metadata.append({
-                    "resume_id": resume.id,
-                    "file_path": resume.file_path,
-                    "skills": resume.sections.get("skills", "")[:500],  # Limit length
-                    "experience": resume.sections.get("experience", "")[:500],
-                    "education": resume.sections.get("education", "")[:500],
-                    "summary": resume.sections.get("summary", "")[:500]
-                })
-                ids.append(resume.id)
+            # Only ids and embeddings are stored; text and sections are looked up
+            # in the ResumeCollection by resume_id
+            ids = [resume.id for resume in resumes]
+            metadata = [{"resume_id": resume_id} for resume_id in ids]
             
             # Add to vector store
-            if documents:
-                self.vector_store.add_documents(documents, embeddings, metadata, ids)
-                logger.info(f"Indexed {len(documents)} resumes in vector store")
+            if ids:
+                self.vector_store.add_documents(None, embeddings, metadata, ids)
+                logger.info(f"Indexed {len(ids)} resumes in vector store")
         
         except Exception as e:
             logger.error(f"Error indexing resumes: {e}")
             raise
     
-    def _rank_candidates(self, resume_collection: ResumeCollection, 
+    def _rank_candidates(self, resumes: List[ResumeDocument], candidate_matrix: np.ndarray,
                         job_description: JobDescription, top_n: int) -> List[CandidateRanking]:
-        """Rank all candidates based on similarity to job description."""
+        """Rank embedded resumes, given with their (dim, N) unit embedding matrix, against the job description."""
         try:
-            # Generate job description embedding
-            job_embedding = self.embedding_manager.generate_single_embedding(job_description.content)
+            # Encode the job description once per job; every candidate is scored against its unit vector
+            job_embedding = job_description.get_unit_embedding(self.embedding_manager.generate_single_embedding)
+            
+            # Select the top N candidates before the expensive per-candidate scoring
+            top_resumes = self._select_top_resumes(resumes, candidate_matrix, job_embedding, top_n)
             
-            # Perform similarity search
-            documents, similarity_scores, metadatas = self.vector_store.similarity_search(
-                job_embedding, top_k=len(resume_collection.resumes)
+            # Encode and score every candidate's sections in one model call and one matrix product
+            candidate_sections = self._score_candidate_sections(
+                [resume_doc for resume_doc, _ in top_resumes], job_embedding
             )
+            # Enhance all base scores in one vectorized call
+            base_scores = _enhance_batch_scores(
+                np.fromiter((score for _, score in top_resumes), dtype=np.float64, count=len(top_resumes))
+            ).tolist()
             
             # Create candidate rankings
             rankings = []
-            for i, (doc, score, metadata) in enumerate(zip(documents, similarity_scores, metadatas)):
-                # Get resume document
-                resume_id = metadata.get("resume_id")
-                resume_doc = resume_collection.get_resume_by_id(resume_id)
+            for i, ((resume_doc, _), base_score, section_scores) in enumerate(
+                    zip(top_resumes, base_scores, candidate_sections)):
+                exact_file_name = self._get_exact_filename(resume_doc.file_path)
+                # Calculate detailed similarity score
+                detailed_score = self._calculate_detailed_similarity_score(
+                    resume_doc, base_score, section_scores
+                )
                 
-                if resume_doc:
-
-                    exact_file_name = self._get_exact_filename(resume_doc.file_path)
-                    # Calculate detailed similarity score
-                    detailed_score = self._calculate_detailed_similarity_score(
-                        job_description, resume_doc, score
-                    )
-                    
-                    # Generate key highlights
-                    highlights = self._generate_candidate_highlights(resume_doc, job_description)
-                    
-                    ranking = CandidateRanking(
-                        rank=i + 1,
-                        resume_id=exact_file_name,
-                        candidate_name=exact_file_name,
-                        similarity_score=detailed_score,
-                        key_highlights=highlights
-                    )
-                    rankings.append(ranking)
+                # Generate key highlights
+                highlights = self._generate_candidate_highlights(resume_doc, job_description)
+                
+                ranking = CandidateRanking(
+                    rank=i + 1,
+                    resume_id=exact_file_name,
+                    candidate_name=exact_file_name,
+                    similarity_score=detailed_score,
+                    key_highlights=highlights
+                )
+                rankings.append(ranking)
             
-            # Return top N candidates
-            return rankings[:top_n]
+            return rankings
         
         except Exception as e:
             logger.error(f"Error ranking candidates: {e}")
             return []
         
+    def _select_top_resumes(self, resumes: List[ResumeDocument], candidate_matrix: np.ndarray,
+                            job_embedding: np.ndarray, top_n: int) -> List[Tuple[ResumeDocument, float]]:
+        """Pick the top N resumes by scoring the stacked (dim, N) embedding matrix in memory."""
+        k = min(top_n, len(resumes))
+        if k <= 0:
+            return []
+        
+        scores = self._to_batch_scale(self._score_resume_matrix(candidate_matrix, job_embedding))
+        
+        # Partial selection is O(N); only the K survivors are fully sorted
+        top_idx = np.argpartition(-scores, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-scores[top_idx], kind="stable")]
+        return [(resumes[idx], float(scores[idx])) for idx in top_idx]
+    
+    def _score_resume_matrix(self, candidate_matrix: np.ndarray, job_embedding: np.ndarray) -> np.ndarray:
+        """Score a dimension-major (dim, N) matrix of unit resume embeddings against the job embedding."""
+        return np.asarray(job_embedding, dtype=np.float32) @ candidate_matrix
+    
+    def _to_batch_scale(self, cosine: np.ndarray) -> np.ndarray:
+        """Map cosine similarities onto the base score scale used by batch ranking."""
+        # 1 / (1 + squared L2 distance) on unit vectors, the scale the batch score curve is tuned for
+        return 1.0 / (3.0 - 2.0 * cosine)
+    
     def _get_exact_filename(self, file_path: str) -> str:
         """Get exact filename without path and extension."""
         import os
@@ -199,25 +365,65 @@ class BatchProcessor:
         name_without_ext = os.path.splitext(filename)[0]
         return name_without_ext
 
-    def _calculate_detailed_similarity_score(self, job_desc: JobDescription, 
-                                           resume_doc: ResumeDocument, base_score: float) -> SimilarityScore:
-        """Calculate detailed similarity score with section breakdown."""
+    def _score_candidate_sections(self, resumes: List[ResumeDocument],
+                                  job_embedding: np.ndarray) -> List[Dict[str, float]]:
+        """Enhanced similarity of every non-empty section of the given resumes to the job embedding.
         
-        # Generate section embeddings
-        section_scores = {}
-        job_embedding = self.embedding_manager.generate_single_embedding(job_desc.content)
+        The full_content section reuses the resume embedding. Other sections are encoded
+        in chunks of SECTION_SCORE_CHUNK; each chunk is scored with one (sections x dim)
+        matrix-vector product and enhanced in one vectorized call on a helper thread
+        while the model encodes the next chunk.
+        """
+        owners, section_names, section_texts = [], [], []
+        reused_owners, reused_vectors = [], []
+        for i, resume_doc in enumerate(resumes):
+            for section_name, section_content in resume_doc.sections.items():
+                if not section_content.strip():
+                    continue
+                if section_name == 'full_content' and resume_doc.unit_embedding is not None:
+                    # The full text was already encoded as the resume embedding
+                    reused_owners.append(i)
+                    reused_vectors.append(resume_doc.unit_embedding)
+                    continue
+                owners.append(i)
+                section_names.append(section_name)
+                section_texts.append(section_content)
         
-        for section_name, section_content in resume_doc.sections.items():
-            if section_content.strip():
-                section_embedding = self.embedding_manager.generate_single_embedding(section_content)
-                raw_similarity = self.similarity_calculator.cosine_similarity_score(
-                    job_embedding, section_embedding
-                )
-                enhanced_similarity = self._enhance_batch_score(raw_similarity)
-                section_scores[section_name] = enhanced_similarity
+        candidate_sections: List[Dict[str, float]] = [{} for _ in resumes]
         
-        enhanced_base_score = self._enhance_batch_score(base_score)
-
+        def score_chunk(section_matrix: np.ndarray) -> List[float]:
+            # The job vector is a unit embedding and the model emits unit section vectors
+            raw_scores = self.similarity_calculator.batch_cosine_similarity(
+                job_embedding, section_matrix, normalized=True
+            )
+            return _enhance_batch_scores(np.asarray(raw_scores, dtype=np.float64)).tolist()
+        
+        if not section_texts:
+            section_scores = []
+        elif len(section_texts) <= SECTION_SCORE_CHUNK:
+            section_scores = score_chunk(self.embedding_manager.generate_embeddings(section_texts))
+        else:
+            # Model inference and BLAS both release the GIL, so the two stages run concurrently;
+            # futures are collected in submission order, keeping scores aligned with section_texts
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                futures = [
+                    executor.submit(score_chunk, self.embedding_manager.generate_embeddings(
+                        section_texts[start:start + SECTION_SCORE_CHUNK]
+                    ))
+                    for start in range(0, len(section_texts), SECTION_SCORE_CHUNK)
+                ]
+                section_scores = [score for future in futures for score in future.result()]
+        
+        for owner, section_name, score in zip(owners, section_names, section_scores):
+            candidate_sections[owner][section_name] = score
+        if reused_vectors:
+            for owner, score in zip(reused_owners, score_chunk(np.stack(reused_vectors))):
+                candidate_sections[owner]['full_content'] = score
+        return candidate_sections
+    
+    def _calculate_detailed_similarity_score(self, resume_doc: ResumeDocument, enhanced_base_score: float,
+                                           section_scores: Dict[str, float]) -> SimilarityScore:
+        """Calculate detailed similarity score from the candidate's enhanced base and section scores."""
         # Calculate confidence
         confidence = min(1.0, enhanced_base_score + 0.1)  # Simple confidence calculation
         
@@ -231,18 +437,6 @@ class BatchProcessor:
             reasoning=reasoning
         )
     
-    def _enhance_batch_score(self, raw_score: float) -> float:
-        """Apply generous score enhancement for batch processing."""
-        # More generous than single analysis - recruiters want to see potential
-        if raw_score < 0.2:
-            return raw_score * 1.5  # Slight boost for very low scores
-        elif raw_score < 0.4:
-            return 0.35 + (raw_score - 0.2) * 2.0  # Significant boost for low-medium
-        elif raw_score < 0.6:
-            return 0.65 + (raw_score - 0.4) * 1.25  # Good boost for medium scores
-        else:
-            return 0.85 + (raw_score - 0.6) * 0.375  # High scores reach 95%+
-
     def _generate_positive_reasoning(self, score: float, section_scores: Dict[str, float]) -> str:
         """Generate more positive, encouraging reasoning for batch results."""
         if score >= 0.75:
@@ -275,9 +469,8 @@ class BatchProcessor:
         """Generate key highlights for a candidate."""
         highlights = []
         
-        # Extract years of experience (simple pattern matching)
-        content_lower = resume_doc.content.lower()
-        if 'year' in content_lower:
+        # Extract years of experience (simple pattern matching, without a lowercased copy)
+        if _EXPERIENCE_RE.search(resume_doc.content):
             highlights.append("Demonstrated work experience")
         
         # Check for education
@@ -300,19 +493,22 @@ class BatchProcessor:
         if not rankings:
             return {"error": "No rankings generated"}
         
-        scores = [ranking.similarity_score.overall_score for ranking in rankings]
+        # One array for every statistic below instead of a Python pass per statistic
+        scores = np.fromiter((ranking.similarity_score.overall_score for ranking in rankings),
+                             dtype=np.float64, count=len(rankings))
+        poor, fair, good, excellent = np.histogram(scores, bins=_SCORE_BUCKET_EDGES)[0].tolist()
         
         return {
             "total_processed": len(rankings),
             "total_candidates": total_candidates,
-            "average_score": np.mean(scores),
-            "median_score": np.median(scores),
-            "max_score": max(scores),
-            "min_score": min(scores),
+            "average_score": float(scores.mean()),
+            "median_score": float(np.median(scores)),
+            "max_score": float(scores.max()),
+            "min_score": float(scores.min()),
             "score_distribution": {
-                "excellent (>0.8)": sum(1 for s in scores if s > 0.8),
-                "good (0.6-0.8)": sum(1 for s in scores if 0.65 <= s <= 0.8),
-                "fair (0.4-0.6)": sum(1 for s in scores if 0.5 <= s < 0.65),
-                "poor (<0.4)": sum(1 for s in scores if s < 0.5)
+                "excellent (>0.8)": excellent,
+                "good (0.6-0.8)": good,
+                "fair (0.4-0.6)": fair,
+                "poor (<0.4)": poor
             }
         }
\ No newline at end of file
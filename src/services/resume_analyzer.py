@@ -1,11 +1,17 @@
 from typing import List, Dict, Optional, Tuple
 import logging
+import re
 from datetime import datetime
-import uuid
+import secrets
 import numpy as np
 
-from src.core.document_processor import DocumentProcessor
-from src.core.embedding_manager import EmbeddingManager
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; term matching falls back to token sets
+    ahocorasick = None
+
+from src.core.document_processor import get_document_processor
+from src.core.embedding_manager import get_embedding_manager
 from src.core.similarity_calculator import SimilarityCalculator
 from src.models.resume_model import ResumeDocument
 from src.models.job_description_model import JobDescription
@@ -13,12 +19,68 @@ from src.models.analysis_result import SingleAnalysisResult, SimilarityScore
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r"\w+")
+
+# Common technical terms and skills
+_COMMON_TERMS = (
+    'python', 'java', 'javascript', 'machine learning', 'data science',
+    'sql', 'aws', 'docker', 'kubernetes', 'react', 'angular', 'node.js',
+    'project management', 'agile', 'scrum', 'leadership', 'communication'
+)
+
+# Potential skills to look for in job descriptions
+_POTENTIAL_SKILLS = (
+    'python', 'java', 'javascript', 'react', 'angular', 'vue.js',
+    'machine learning', 'deep learning', 'tensorflow', 'pytorch',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
+    'sql', 'mongodb', 'postgresql', 'redis', 'elasticsearch'
+)
+
+# Every term either matcher looks for, in first-seen order
+_ALL_TERMS = tuple(dict.fromkeys(_COMMON_TERMS + _POTENTIAL_SKILLS))
+
+def _build_term_automaton():
+    """Build an Aho-Corasick automaton over _ALL_TERMS."""
+    automaton = ahocorasick.Automaton()
+    for term in _ALL_TERMS:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+_TERM_AUTOMATON = _build_term_automaton() if ahocorasick else None
+
+def _is_word_char(char: str) -> bool:
+    """Whether char is a regex word character."""
+    return char.isalnum() or char == "_"
+
+def _find_terms(content_lower: str) -> set:
+    """Return the terms of _ALL_TERMS that occur in already-lowercased content.
+    
+    Single words must stand alone (so 'java' does not match inside 'javascript');
+    phrases and dotted names match anywhere.
+    """
+    if _TERM_AUTOMATON is None:
+        tokens = set(_TOKEN_RE.findall(content_lower))
+        return {term for term in _ALL_TERMS if (term in tokens if term.isalnum() else term in content_lower)}
+    
+    # One linear pass over the content finds every term at once
+    found = set()
+    for end, term in _TERM_AUTOMATON.iter(content_lower):
+        if term.isalnum():
+            start = end - len(term) + 1
+            if ((start > 0 and _is_word_char(content_lower[start - 1]))
+                    or (end + 1 < len(content_lower) and _is_word_char(content_lower[end + 1]))):
+                continue
+        found.add(term)
+    return found
+
 class ResumeAnalyzer:
     """Core service for analyzing individual resumes against job descriptions."""
     
     def __init__(self):
-        self.document_processor = DocumentProcessor()
-        self.embedding_manager = EmbeddingManager()
+        # Heavy components are process-wide singletons shared with batch processing
+        self.document_processor = get_document_processor()
+        self.embedding_manager = get_embedding_manager()
         self.similarity_calculator = SimilarityCalculator()
     
     def analyze_single_resume(self, resume_path: str, job_description: JobDescription) -> SingleAnalysisResult:
@@ -35,9 +97,11 @@ class ResumeAnalyzer:
                 job_description, resume_doc, resume_section_embeddings
             )
             
-            # Generate insights
-            key_matches = self._identify_key_matches(resume_doc, job_description)
-            missing_skills = self._identify_missing_skills(resume_doc, job_description)
+            # Generate insights from one term scan of each document
+            resume_terms = _find_terms(resume_doc.content_lower)
+            job_terms = _find_terms(job_description.content_lower)
+            key_matches = self._identify_key_matches(resume_terms, job_terms)
+            missing_skills = self._identify_missing_skills(resume_terms, job_terms)
             recommendations = self._generate_recommendations(similarity_score, missing_skills)
             
             return SingleAnalysisResult(
@@ -56,18 +120,12 @@ class ResumeAnalyzer:
     
     def _process_resume_file(self, file_path: str) -> ResumeDocument:
         """Process resume file and extract structured information."""
-        # Load document
-        documents = self.document_processor.load_pdf(file_path)
-        
-        # Combine all content
-        full_content = "\n".join([doc.page_content for doc in documents])
-        
-        # Extract sections
-        sections = self.document_processor.extract_key_sections(full_content)
+        # Load the document, combine its content and extract sections
+        full_content, sections = self.document_processor.parse_resume(file_path)
         
         # Create resume document
         resume_doc = ResumeDocument(
-            id=str(uuid.uuid4()),
+            id=secrets.token_hex(16),
             file_path=file_path,
             content=full_content,
             sections=sections,
@@ -76,24 +134,29 @@ class ResumeAnalyzer:
         
         return resume_doc
     
-    def _generate_section_embeddings(self, resume_doc: ResumeDocument) -> Dict[str, List[float]]:
+    def _generate_section_embeddings(self, resume_doc: ResumeDocument) -> Dict[str, np.ndarray]:
         """Generate embeddings for different resume sections."""
-        section_embeddings = {}
-        
-        for section_name, section_content in resume_doc.sections.items():
-            if section_content.strip():  # Only process non-empty sections
-                embedding = self.embedding_manager.generate_single_embedding(section_content)
-                section_embeddings[section_name] = embedding
+        # Only process non-empty sections, all in one batched model call
+        section_names = [name for name, content in resume_doc.sections.items() if content.strip()]
+        section_matrix = self.embedding_manager.generate_embeddings(
+            [resume_doc.sections[name] for name in section_names]
+        )
+        # Rows of the float32 matrix are used as-is; no per-section copies
+        section_embeddings = dict(zip(section_names, section_matrix))
         
+        resume_doc.set_section_embeddings(section_embeddings)
+        if resume_doc.embedding is None and 'full_content' in section_embeddings:
+            # The full text was encoded in the same batch; reuse it as the resume embedding
+            resume_doc.embedding = section_embeddings['full_content']
         return section_embeddings
     
     def _calculate_comprehensive_similarity(self, job_desc: JobDescription, 
                                           resume_doc: ResumeDocument,
-                                          resume_embeddings: Dict[str, List[float]]) -> SimilarityScore:
+                                          resume_embeddings: Dict[str, np.ndarray]) -> SimilarityScore:
         """Calculate comprehensive similarity score using multiple factors."""
         
-        # Generate job description embedding
-        job_embedding = self.embedding_manager.generate_single_embedding(job_desc.content)
+        # Job description embedding, encoded on the first analysis against this job and reused after
+        job_unit = job_desc.get_unit_embedding(self.embedding_manager.generate_single_embedding)
         
         # Calculate weighted similarity across sections
         section_weights = {
@@ -103,9 +166,15 @@ class ResumeAnalyzer:
             'education': 0.10
         }
         
-        overall_score, section_scores = self.similarity_calculator.weighted_similarity_score(
-            job_embedding, resume_embeddings, section_weights
-        )
+        if resume_doc.section_matrix is not None:
+            # All sections are scored against the job in one matrix-vector product
+            overall_score, section_scores = self.similarity_calculator.weighted_section_matrix_score(
+                job_unit, resume_doc.section_keys, resume_doc.section_matrix, section_weights, normalized=True
+            )
+        else:
+            overall_score, section_scores = self.similarity_calculator.weighted_similarity_score(
+                job_unit, resume_embeddings, section_weights, normalized=True
+            )
         
         # Calculate confidence based on content availability and score distribution
         confidence = self._calculate_confidence(section_scores, resume_doc)
@@ -130,8 +199,10 @@ class ResumeAnalyzer:
         
         # Factor in score consistency (lower variance = higher confidence)
         if len(section_scores) > 1:
+            # A handful of sections: plain Python beats numpy's per-call dispatch here
             scores = list(section_scores.values())
-            score_variance = np.var(scores) if len(scores) > 1 else 0
+            mean_score = sum(scores) / len(scores)
+            score_variance = sum((score - mean_score) ** 2 for score in scores) / len(scores)
             consistency_factor = max(0, 1 - score_variance)
         else:
             consistency_factor = 0.5
@@ -173,45 +244,25 @@ class ResumeAnalyzer:
         
         return " ".join(reasoning_parts)
     
-    def _identify_key_matches(self, resume_doc: ResumeDocument, job_desc: JobDescription) -> List[str]:
-        """Identify key matching points between resume and job description."""
+    def _identify_key_matches(self, resume_terms: set, job_terms: set) -> List[str]:
+        """Identify key matching points between resume and job description terms found by _find_terms."""
         matches = []
         
         # Simple keyword-based matching for demonstration
         # In a production system, this would use more sophisticated NLP
-        job_content_lower = job_desc.content.lower()
-        resume_content_lower = resume_doc.content.lower()
-        
-        # Common technical terms and skills
-        common_terms = [
-            'python', 'java', 'javascript', 'machine learning', 'data science',
-            'sql', 'aws', 'docker', 'kubernetes', 'react', 'angular', 'node.js',
-            'project management', 'agile', 'scrum', 'leadership', 'communication'
-        ]
-        
-        for term in common_terms:
-            if term in job_content_lower and term in resume_content_lower:
+        for term in _COMMON_TERMS:
+            if term in job_terms and term in resume_terms:
                 matches.append(f"Relevant experience with {term}")
         
         return matches[:5]  # Return top 5 matches
     
-    def _identify_missing_skills(self, resume_doc: ResumeDocument, job_desc: JobDescription) -> List[str]:
-        """Identify skills mentioned in job description but not in resume."""
+    def _identify_missing_skills(self, resume_terms: set, job_terms: set) -> List[str]:
+        """Identify skills mentioned in job description but not in resume, from terms found by _find_terms."""
         missing = []
         
-        job_content_lower = job_desc.content.lower()
-        resume_content_lower = resume_doc.content.lower()
-        
         # Extract potential skills from job description
-        potential_skills = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue.js',
-            'machine learning', 'deep learning', 'tensorflow', 'pytorch',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
-            'sql', 'mongodb', 'postgresql', 'redis', 'elasticsearch'
-        ]
-        
-        for skill in potential_skills:
-            if skill in job_content_lower and skill not in resume_content_lower:
+        for skill in _POTENTIAL_SKILLS:
+            if skill in job_terms and skill not in resume_terms:
                 missing.append(skill.title())
         
         return missing[:5]  # Return top 5 missing skills